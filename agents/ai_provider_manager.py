@@ -22,7 +22,12 @@ Centralized AI provider management that:
 
 import asyncio
 import time
-from typing import Dict, Any, Optional, List, AsyncGenerator
+from typing import Dict, Any, Optional, List, AsyncGenerator, Tuple
+import httpx
+import orjson
+from openai import AsyncOpenAI
+from groq import AsyncGroq
+from anthropic import AsyncAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -31,40 +36,133 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
 from config.settings import settings
-?from utils.logger import logger
+from models.schemas import AIProvider, AIResponse, StreamingChunk
+from utils.email_parser import EmailParser
+from utils.logger import logger
+
+EXTRACT_SENDER_PROMPT = """You are an expert email parser. Extract the sender's name from the email content. 
+        Return only the name, nothing else. If no clear name is found, return 'Unknown'."""
+
+REPLY_PROMPT_TEMPLATE = """You are a professional email assistant. Generate a helpful, 
+        concise reply to {sender_name}. Be polite, professional, and address their concerns appropriately."""
+
+# Supported providers in preference order
+PROVIDER_DISPLAY_NAMES = {
+    AIProvider.OPENAI: "OpenAI",
+    AIProvider.GROQ: "Groq",
+    AIProvider.GOOGLE: "Google Gemini",
+    AIProvider.ANTHROPIC: "Anthropic"
+}
+
+# Upper bound (seconds) on a single provider health probe
+HEALTH_CHECK_TIMEOUT = 2.0
+
+# WebSocket frames are flushed once this many bytes or this much time has accumulated
+STREAM_FLUSH_BYTES = 4096
+STREAM_FLUSH_INTERVAL = 0.005
 
 class StreamingCallbackHandler(AsyncCallbackHandler):
-    """Custom callback handler for streaming responses."""
+    """
+    Custom callback handler for streaming responses.
+    
+    Tokens are coalesced into binary WebSocket frames of newline-delimited
+    JSON chunks. Sends are awaited inline, so a slow client applies
+    backpressure to the stream instead of growing an unbounded queue.
+    """
     
     def __init__(self, websocket=None):
         self.websocket = websocket
-        self.chunks = []
+        # Only the latest chunk is needed (it is re-sent as final in on_llm_end).
+        # Chunks are plain dicts with StreamingChunk's fields to skip per-token validation.
+        self._last: Optional[Dict[str, Any]] = None
+        self._count = 0
+        self._buf = bytearray()
+        self._last_flush = time.monotonic()
+    
+    async def _flush(self) -> None:
+        """Send buffered chunks as a single binary frame."""
+        if not self._buf:
+            return
+        try:
+            await self.websocket.send_bytes(bytes(self._buf))
+        except Exception as e:
+            logger.error(f"Error sending streaming chunk: {e}")
+        self._buf.clear()
+        self._last_flush = time.monotonic()
     
     async def on_llm_new_token(self, token: str, **kwargs) -> None:
         """Handle new token in streaming response."""
-        chunk = StreamingChunk(
-            chunk_id=f"chunk_{len(self.chunks)}",
-            content=token,
-            is_final=False
-        )
-        self.chunks.append(chunk)
+        chunk = {"chunk_id": f"chunk_{self._count}", "content": token, "is_final": False}
+        self._count += 1
+        self._last = chunk
         
         if self.websocket:
-            try:
-                await self.websocket.send_text(chunk.json())
-            except Exception as e:
-                logger.error(f"Error sending streaming chunk: {e}")
+            self._buf += orjson.dumps(chunk) + b"\n"
+            if (len(self._buf) >= STREAM_FLUSH_BYTES
+                    or time.monotonic() - self._last_flush >= STREAM_FLUSH_INTERVAL):
+                await self._flush()
     
     async def on_llm_end(self, response: LLMResult, **kwargs) -> None:
         """Handle end of LLM response."""
-        if self.chunks:
+        if self._last is not None:
             # Mark last chunk as final
-            self.chunks[-1].is_final = True
+            self._last["is_final"] = True
             if self.websocket:
-                try:
-                    await self.websocket.send_text(self.chunks[-1].json())
-                except Exception as e:
-                    logger.error(f"Error sending final chunk: {e}")
+                self._buf += orjson.dumps(self._last) + b"\n"
+                await self._flush()
+
+class _BatchQueue:
+    """Coalesces concurrent requests for one provider into a single abatch call."""
+    
+    def __init__(self, llm, window_ms: int, max_batch: int, max_concurrency: int):
+        self.llm = llm
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self.pending: List[Tuple[list, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def submit(self, messages: list):
+        """Queue messages for the next batch and wait for their response."""
+        # =============== start submit ======
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((messages, future))
+        
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        
+        return await future
+    
+    async def _flush_after_window(self):
+        """Wait for the batching window, then drain the queue in abatch calls."""
+        # =============== start _flush_after_window ======
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        
+        while self.pending:
+            items = self.pending[:self.max_batch]
+            del self.pending[:self.max_batch]
+            await self._run_batch(items)
+    
+    async def _run_batch(self, items: List[Tuple[list, asyncio.Future]]):
+        """Run one abatch call and resolve each waiting future."""
+        # =============== start _run_batch ======
+        try:
+            results = await self.llm.abatch(
+                [messages for messages, _ in items],
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(items)
+        
+        for (_, future), result in zip(items, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
 
 class AIProviderManager:
     """Manages multiple AI providers with LangChain integration."""
@@ -73,127 +171,311 @@ class AIProviderManager:
         """Initialize AI provider manager."""
         # =============== start __init__ ======
         self.providers = {}
+        self._batch_queues: Dict[tuple, _BatchQueue] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # One keep-alive HTTP/2 pool shared by every provider client
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=128),
+            timeout=httpx.Timeout(60, connect=5)
+        )
+        # Provider SDK clients used for streaming without LangChain's callback layer
+        self._native_clients: Dict[AIProvider, Any] = {}
+        # Small, fast models for simple tasks such as sender extraction
+        self._small_model_overrides = {
+            AIProvider.OPENAI: "gpt-4o-mini",
+            AIProvider.GROQ: "llama-3.1-8b-instant"
+        }
+        self._model_variants: Dict[Tuple[AIProvider, str], Any] = {}
+        # Fixed system prompts are built once and the same message reused per call
+        self._system_messages = {
+            EXTRACT_SENDER_PROMPT: SystemMessage(content=EXTRACT_SENDER_PROMPT)
+        }
         self._initialize_providers()
     
     def _initialize_providers(self):
-        """Initialize available AI providers."""
+        """Record which AI providers are configured; clients are built on first use."""
         # =============== start _initialize_providers ======
-        # OpenAI
-        if settings.is_provider_available(AIProvider.OPENAI):
-            config = settings.get_ai_provider_config(AIProvider.OPENAI)
-            self.providers[AIProvider.OPENAI] = ChatOpenAI(
+        self._available_providers = [
+            provider for provider in PROVIDER_DISPLAY_NAMES
+            if settings.is_provider_available(provider)
+        ]
+    
+    def _create_llm(self, provider: AIProvider, model: Optional[str] = None) -> Any:
+        """Construct the LangChain chat model for a provider, optionally overriding its model."""
+        # =============== start _create_llm ======
+        # Uncached: replies are sampled and health probes must reach the provider
+        config = settings.get_ai_provider_config(provider)
+        model = model or config["model"]
+        
+        if provider == AIProvider.OPENAI:
+            return ChatOpenAI(
                 api_key=config["api_key"],
-                model=config["model"],
+                model=model,
                 max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
+                temperature=config["temperature"],
+                cache=False,
+                max_retries=2,
+                http_async_client=self._http
             )
-            logger.info("OpenAI provider initialized")
-        
-        # Groq
-        if settings.is_provider_available(AIProvider.GROQ):
-            config = settings.get_ai_provider_config(AIProvider.GROQ)
-            self.providers[AIProvider.GROQ] = ChatGroq(
+        if provider == AIProvider.GROQ:
+            return ChatGroq(
                 api_key=config["api_key"],
-                model=config["model"],
+                model=model,
                 max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
+                temperature=config["temperature"],
+                cache=False,
+                http_async_client=self._http
             )
-            logger.info("Groq provider initialized")
-        
-        # Google Gemini
-        if settings.is_provider_available(AIProvider.GOOGLE):
-            config = settings.get_ai_provider_config(AIProvider.GOOGLE)
-            self.providers[AIProvider.GOOGLE] = ChatGoogleGenerativeAI(
+        if provider == AIProvider.GOOGLE:
+            return ChatGoogleGenerativeAI(
                 api_key=config["api_key"],
-                model=config["model"],
+                model=model,
                 max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
+                temperature=config["temperature"],
+                cache=False
             )
-            logger.info("Google Gemini provider initialized")
-        
-        # Anthropic
-        if settings.is_provider_available(AIProvider.ANTHROPIC):
-            config = settings.get_ai_provider_config(AIProvider.ANTHROPIC)
-            self.providers[AIProvider.ANTHROPIC] = ChatAnthropic(
+        if provider == AIProvider.ANTHROPIC:
+            return ChatAnthropic(
                 api_key=config["api_key"],
-                model=config["model"],
+                model=model,
                 max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
+                temperature=config["temperature"],
+                cache=False
             )
-            logger.info("Anthropic provider initialized")
+        raise ValueError(f"Unsupported provider: {provider}")
+    
+    def _create_native_client(self, provider: AIProvider) -> Optional[Any]:
+        """Construct the provider SDK client used for native streaming, if supported."""
+        # =============== start _create_native_client ======
+        config = settings.get_ai_provider_config(provider)
+        if provider == AIProvider.OPENAI:
+            return AsyncOpenAI(api_key=config["api_key"], http_client=self._http)
+        if provider == AIProvider.GROQ:
+            return AsyncGroq(api_key=config["api_key"], http_client=self._http)
+        if provider == AIProvider.ANTHROPIC:
+            return AsyncAnthropic(api_key=config["api_key"], http_client=self._http)
+        return None
+    
+    def _get_llm(self, provider: AIProvider, model: Optional[str] = None) -> Optional[Any]:
+        """Get the provider instance, or a cached variant running a different model."""
+        # =============== start _get_llm ======
+        if not model:
+            return self.get_provider(provider)
+        key = (provider, model)
+        llm = self._model_variants.get(key)
+        if llm is None and self.get_provider(provider) is not None:
+            llm = self._create_llm(provider, model)
+            self._model_variants[key] = llm
+        return llm
+    
+    async def aclose(self):
+        """Close the shared HTTP connection pool."""
+        # =============== start aclose ======
+        await self._http.aclose()
     
     def get_available_providers(self) -> List[AIProvider]:
         """Get list of available providers."""
         # =============== start get_available_providers ======
-        return list(self.providers.keys())
+        return list(self._available_providers)
     
     def get_provider(self, provider: AIProvider) -> Optional[Any]:
-        """Get specific provider instance."""
+        """Get specific provider instance, constructing it on first use."""
         # =============== start get_provider ======
-        return self.providers.get(provider)
+        llm = self.providers.get(provider)
+        if llm is None and provider in self._available_providers:
+            # Construction is synchronous, so concurrent first calls can't race here
+            llm = self._create_llm(provider)
+            self.providers[provider] = llm
+            native_client = self._create_native_client(provider)
+            if native_client is not None:
+                self._native_clients[provider] = native_client
+            logger.info(f"{PROVIDER_DISPLAY_NAMES[provider]} provider initialized")
+        return llm
+    
+    def resolve(self, preferred: AIProvider) -> Tuple[AIProvider, Any]:
+        """Return (provider, llm) for the preferred provider, else the first available one."""
+        # =============== start resolve ======
+        llm = self.get_provider(preferred)
+        if llm:
+            return preferred, llm
+        
+        if not self._available_providers:
+            logger.error("No AI providers available. Please configure API keys in .env file")
+            raise ValueError("No AI providers available. Please configure API keys in .env file")
+        
+        provider = self._available_providers[0]
+        logger.warning(f"Requested provider {preferred.value} not available, using {provider.value}")
+        return provider, self.get_provider(provider)
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> list:
+        """Build the message list for a prompt, reusing interned system messages."""
+        # =============== start _build_messages ======
+        if not system_prompt:
+            return [HumanMessage(content=prompt)]
+        system_message = self._system_messages.get(system_prompt)
+        if system_message is None:
+            system_message = SystemMessage(content=system_prompt)
+        return [system_message, HumanMessage(content=prompt)]
+    
+    def _get_batch_queue(self, provider: AIProvider, model: Optional[str] = None) -> _BatchQueue:
+        """Get the request coalescer for a provider and model."""
+        # =============== start _get_batch_queue ======
+        # Each message list carries its own SystemMessage, so requests with
+        # different system prompts can share one batch
+        key = (provider, model)
+        queue = self._batch_queues.get(key)
+        if queue is None:
+            queue = _BatchQueue(
+                self._get_llm(provider, model),
+                window_ms=settings.batch_window_ms,
+                max_batch=settings.batch_max_size,
+                max_concurrency=settings.batch_max_concurrency
+            )
+            self._batch_queues[key] = queue
+        return queue
     
     async def generate_response(
         self,
         prompt: str,
         provider: AIProvider,
         system_prompt: Optional[str] = None,
-        use_cache: bool = True
+        model: Optional[str] = None
     ) -> AIResponse:
-        """Generate AI response using specified provider."""
+        """
+        Generate AI response using specified provider.
+        
+        Concurrent calls with the same provider, model, prompt and system prompt
+        share a single in-flight request instead of each calling the provider.
+        `model` overrides the provider's configured model for this call.
+        """
         # =============== start generate_response ======
-        start_time = time.time()
+        key = (provider, model, system_prompt, prompt)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate_response(prompt, provider, system_prompt, model)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+    
+    async def _generate_response(
+        self,
+        prompt: str,
+        provider: AIProvider,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AIResponse:
+        """Call the provider through the batch queue."""
+        # =============== start _generate_response ======
+        start_time = time.perf_counter()
+        model_name = model or settings.default_model
         
         try:
-            # Check cache first
-            if use_cache:
-                cached_response = await cache_service.get_ai_response(
-                    prompt, provider.value, settings.default_model
-                )
-                if cached_response:
-                    logger.info(f"Using cached response for {provider.value}")
-                    return AIResponse(**cached_response)
-            
             # Get provider
-            llm = self.get_provider(provider)
+            llm = self._get_llm(provider, model)
             if not llm:
                 raise ValueError(f"Provider {provider.value} not available")
             
             # Prepare messages
-            messages = []
-            if system_prompt:
-                messages.append(SystemMessage(content=system_prompt))
-            messages.append(HumanMessage(content=prompt))
+            messages = self._build_messages(prompt, system_prompt)
             
-            # Generate response
-            response = await llm.ainvoke(messages)
+            # Generate response, sharing a batch with concurrent callers
+            response = await self._get_batch_queue(provider, model).submit(messages)
             
             # Calculate metrics
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             tokens_used = getattr(response, 'response_metadata', {}).get('token_usage', {}).get('total_tokens', 0)
             
             # Create AI response
             ai_response = AIResponse(
                 reply=response.content,
                 confidence=0.9,  # Default confidence
-                model_used=settings.default_model,
+                model_used=model_name,
                 provider=provider,
                 tokens_used=tokens_used,
                 processing_time=processing_time
             )
             
-            # Cache response
-            if use_cache:
-                await cache_service.set_ai_response(
-                    prompt, provider.value, settings.default_model, ai_response.dict()
-                )
-            
-            logger.info(f"Generated response using {provider.value} in {processing_time:.2f}s")
+            logger.info("Generated response using %s in %.2fs", provider.value, processing_time)
             return ai_response
             
         except Exception as e:
             logger.error(f"Error generating response with {provider.value}: {e}")
             raise
     
+    async def _native_astream(
+        self,
+        provider: AIProvider,
+        client: Any,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream raw text deltas straight from the provider SDK."""
+        # =============== start _native_astream ======
+        config = settings.get_ai_provider_config(provider)
+        
+        if provider == AIProvider.ANTHROPIC:
+            request = {
+                "model": config["model"],
+                "max_tokens": config["max_tokens"],
+                "temperature": config["temperature"],
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            if system_prompt:
+                request["system"] = system_prompt
+            async with client.messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    yield text
+            return
+        
+        # OpenAI-compatible chat completions API (OpenAI, Groq)
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        stream = await client.chat.completions.create(
+            model=config["model"],
+            messages=messages,
+            max_tokens=config["max_tokens"],
+            temperature=config["temperature"],
+            stream=True
+        )
+        async for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+    
+    async def _raw_stream(
+        self,
+        prompt: str,
+        provider: AIProvider,
+        system_prompt: Optional[str] = None,
+        websocket=None
+    ) -> AsyncGenerator[str, None]:
+        """Stream raw text tokens, forwarding them to the websocket if one is given."""
+        # =============== start _raw_stream ======
+        llm = self.get_provider(provider)
+        if not llm:
+            raise ValueError(f"Provider {provider.value} not available")
+        
+        # Set up streaming callback
+        callback_handler = StreamingCallbackHandler(websocket)
+        
+        native_client = self._native_clients.get(provider)
+        if native_client is not None:
+            # Provider SDK stream; the handler is driven directly
+            async for token in self._native_astream(provider, native_client, prompt, system_prompt):
+                await callback_handler.on_llm_new_token(token)
+                yield token
+            await callback_handler.on_llm_end(LLMResult(generations=[]))
+            return
+        
+        messages = self._build_messages(prompt, system_prompt)
+        async for chunk in llm.astream(messages, callbacks=[callback_handler]):
+            if getattr(chunk, 'content', None):
+                yield chunk.content
+    
     async def generate_response_stream(
         self,
         prompt: str,
@@ -201,40 +483,24 @@ class AIProviderManager:
         system_prompt: Optional[str] = None,
         websocket=None
     ) -> AsyncGenerator[StreamingChunk, None]:
-        """Generate streaming AI response."""
+        """Generate streaming AI response, wrapping raw tokens as StreamingChunk objects."""
         # =============== start generate_response_stream ======
         try:
-            # Get provider
-            llm = self.get_provider(provider)
-            if not llm:
-                raise ValueError(f"Provider {provider.value} not available")
-            
-            # Prepare messages
-            messages = []
-            if system_prompt:
-                messages.append(SystemMessage(content=system_prompt))
-            messages.append(HumanMessage(content=prompt))
-            
-            # Set up streaming callback
-            callback_handler = StreamingCallbackHandler(websocket)
-            
-            # Generate streaming response
-            async for chunk in llm.astream(messages, callbacks=[callback_handler]):
-                if hasattr(chunk, 'content') and chunk.content:
-                    streaming_chunk = StreamingChunk(
-                        chunk_id=f"chunk_{int(time.time() * 1000)}",
-                        content=chunk.content,
-                        is_final=False
-                    )
-                    yield streaming_chunk
+            chunk_index = 0
+            async for token in self._raw_stream(prompt, provider, system_prompt, websocket):
+                yield StreamingChunk(
+                    chunk_id=f"chunk_{chunk_index}",
+                    content=token,
+                    is_final=False
+                )
+                chunk_index += 1
             
             # Send final chunk
-            final_chunk = StreamingChunk(
-                chunk_id=f"chunk_final_{int(time.time() * 1000)}",
+            yield StreamingChunk(
+                chunk_id=f"chunk_final_{chunk_index}",
                 content="",
                 is_final=True
             )
-            yield final_chunk
             
         except Exception as e:
             logger.error(f"Error generating streaming response with {provider.value}: {e}")
@@ -247,14 +513,17 @@ class AIProviderManager:
     ) -> Optional[str]:
         """Extract sender name using AI."""
         # =============== start extract_sender_name ======
-        system_prompt = """You are an expert email parser. Extract the sender's name from the email content. 
-        Return only the name, nothing else. If no clear name is found, return 'Unknown'."""
+        # Clear "From:" headers and sign-offs don't need an LLM round-trip
+        name = EmailParser.extract_sender_name_fast(email_content)
+        if name:
+            return name
         
         try:
             response = await self.generate_response(
                 prompt=email_content,
                 provider=provider,
-                system_prompt=system_prompt
+                system_prompt=EXTRACT_SENDER_PROMPT,
+                model=self._small_model_overrides.get(provider)
             )
             
             name = response.reply.strip()
@@ -272,14 +541,11 @@ class AIProviderManager:
     ) -> str:
         """Generate email reply using AI."""
         # =============== start generate_reply ======
-        system_prompt = f"""You are a professional email assistant. Generate a helpful, 
-        concise reply to {sender_name}. Be polite, professional, and address their concerns appropriately."""
-        
         try:
             response = await self.generate_response(
                 prompt=email_content,
                 provider=provider,
-                system_prompt=system_prompt
+                system_prompt=REPLY_PROMPT_TEMPLATE.format(sender_name=sender_name)
             )
             
             return response.reply
@@ -295,26 +561,99 @@ class AIProviderManager:
     ) -> List[Dict[str, Any]]:
         """Process multiple emails concurrently."""
         # =============== start batch_process_emails ======
-        tasks = []
+        if len(emails) > 1:
+            return await self.abatch_process_emails(emails, provider)
+        
+        results = await asyncio.gather(
+            *[self.process_single_email(email, provider) for email in emails],
+            return_exceptions=True
+        )
+        
+        # Handle exceptions in place; gather already returns one slot per email
+        for i in range(len(results)):
+            if isinstance(results[i], Exception):
+                logger.error(f"Error processing email {i}: {results[i]}")
+                results[i] = {
+                    "error": str(results[i]),
+                    "email": emails[i]
+                }
+        
+        return results
+    
+    async def abatch_process_emails(
+        self,
+        emails: List[Dict[str, Any]],
+        provider: AIProvider = AIProvider.OPENAI
+    ) -> List[Dict[str, Any]]:
+        """
+        Process multiple emails with one batched LLM call per stage.
         
-        for email in emails:
-            task = self.process_single_email(email, provider)
-            tasks.append(task)
+        Sender extraction for every email is submitted as a single abatch call,
+        followed by a single abatch call for all replies, instead of two
+        sequential round-trips per email.
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            emails: Emails to process, each with a "content" key
+            provider: AI provider to use
+            
+        Returns:
+            Results in the same order and shape as process_single_email
+        """
+        # =============== start abatch_process_emails ======
+        llm = self.get_provider(provider)
+        if not llm:
+            # Fail each email individually, as the per-email path does
+            error = f"Provider {provider.value} not available"
+            logger.error(f"Error processing emails: {error}")
+            return [
+                {"error": error, "provider": provider.value, "success": False}
+                for _ in emails
+            ]
+        
+        batch_config = {"max_concurrency": settings.batch_max_concurrency}
+        contents = [email.get("content", "") for email in emails]
+        
+        # Stage 1: regex fast path, then extract the remaining sender names in one batch
+        sender_names = [EmailParser.extract_sender_name_fast(content) for content in contents]
+        pending = [i for i, name in enumerate(sender_names) if name is None]
+        
+        if pending:
+            extract_msgs = [self._build_messages(contents[i], EXTRACT_SENDER_PROMPT) for i in pending]
+            extract_llm = self._get_llm(provider, self._small_model_overrides.get(provider))
+            extract_results = await extract_llm.abatch(extract_msgs, config=batch_config, return_exceptions=True)
+            
+            for i, result in zip(pending, extract_results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error extracting sender name for email {i}: {result}")
+                    continue
+                name = result.content.strip()
+                sender_names[i] = name if name and name != "Unknown" else None
+        
+        # Stage 2: generate all replies in one batch
+        reply_msgs = [
+            self._build_messages(content, REPLY_PROMPT_TEMPLATE.format(sender_name=name or "there"))
+            for name, content in zip(sender_names, contents)
+        ]
+        reply_results = await llm.abatch(reply_msgs, config=batch_config, return_exceptions=True)
         
-        # Handle exceptions
         processed_results = []
-        for i, result in enumerate(results):
+        for i, result in enumerate(reply_results):
             if isinstance(result, Exception):
-                logger.error(f"Error processing email {i}: {result}")
+                logger.error(f"Error generating reply for email {i}: {result}")
                 processed_results.append({
                     "error": str(result),
-                    "email": emails[i]
+                    "provider": provider.value,
+                    "success": False
                 })
             else:
-                processed_results.append(result)
+                processed_results.append({
+                    "sender_name": sender_names[i],
+                    "reply": result.content,
+                    "provider": provider.value,
+                    "success": True
+                })
         
+        logger.info(f"Batch processed {len(emails)} emails using {provider.value}")
         return processed_results
     
     async def process_single_email(
@@ -352,33 +691,43 @@ class AIProviderManager:
                 "success": False
             }
     
+    async def _probe(self, provider: AIProvider) -> Tuple[AIProvider, Dict[str, Any]]:
+        """Ping a single provider and report its status."""
+        # =============== start _probe ======
+        try:
+            # Simple test prompt, bounded so one slow provider can't stall the check
+            test_response = await asyncio.wait_for(
+                self.generate_response(
+                    prompt="Hello, this is a test.",
+                    provider=provider
+                ),
+                timeout=HEALTH_CHECK_TIMEOUT
+            )
+            
+            return provider, {
+                "status": "healthy",
+                "response_time": test_response.processing_time,
+                "model": test_response.model_used
+            }
+            
+        except asyncio.TimeoutError:
+            return provider, {
+                "status": "unhealthy",
+                "error": f"Timed out after {HEALTH_CHECK_TIMEOUT}s"
+            }
+        except Exception as e:
+            return provider, {
+                "status": "unhealthy",
+                "error": str(e)
+            }
+    
     async def get_provider_health(self) -> Dict[str, Any]:
-        """Check health of all providers."""
+        """Check health of all providers concurrently."""
         # =============== start get_provider_health ======
-        health_status = {}
-        
-        for provider in self.get_available_providers():
-            try:
-                # Simple test prompt
-                test_response = await self.generate_response(
-                    prompt="Hello, this is a test.",
-                    provider=provider,
-                    use_cache=False
-                )
-                
-                health_status[provider.value] = {
-                    "status": "healthy",
-                    "response_time": test_response.processing_time,
-                    "model": test_response.model_used
-                }
-                
-            except Exception as e:
-                health_status[provider.value] = {
-                    "status": "unhealthy",
-                    "error": str(e)
-                }
-        
-        return health_status
+        results = await asyncio.gather(
+            *[self._probe(provider) for provider in self.get_available_providers()]
+        )
+        return {provider.value: status for provider, status in results}
 
 # Global AI provider manager instance
 ai_provider_manager = AIProviderManager()
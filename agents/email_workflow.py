@@ -21,17 +21,152 @@ Complete email workflow that:
 5. Sends email response
 """
 
-import json
+import asyncio
+import itertools
 import os
+import re
+import sys
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
+import orjson
+
 from agents.llm_manager import llm_manager
 from utils.logger import logger
 
-@dataclass
+# Fallback intent keywords, in priority order
+INTENT_KEYWORDS = {
+    "sales": ["demo", "pricing", "buy", "purchase", "cost", "price", "interested", "product"],
+    "support": ["help", "issue", "problem", "bug", "error", "not working", "support"],
+    "partnership": ["partnership", "collaborate", "partner", "business", "deal"],
+    "general": ["hello", "hi", "information", "question", "inquiry"]
+}
+
+INTENT_PRIORITY = {intent: rank for rank, intent in enumerate(INTENT_KEYWORDS)}
+
+# Every intent's keywords in one alternation with a named group per intent, so a
+# single scan of the email finds all hits and match.lastgroup names the intent.
+# Keywords must start a word ("hi" skips "this") but may be inflected ("bugs", "prices")
+INTENT_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})"
+        for intent, keywords in INTENT_KEYWORDS.items()
+    ) + r')\w*',
+    re.IGNORECASE
+)
+
+# Prompt templates, built once; filled with str.format per email
+INTENT_PROMPT = """
+    Analyze this email and determine the primary intent:
+    
+    From: {name} ({from_email})
+    Subject: {subject}
+    Content: {content}
+    
+    Classify the intent as one of: sales, support, partnership, general
+    Also extract any specific requests or key information.
+    
+    Return JSON format:
+    {{
+        "intent": "sales|support|partnership|general",
+        "confidence": 0.0-1.0,
+        "key_requests": ["list of specific requests"],
+        "urgency": "low|medium|high"
+    }}
+    """
+
+INTENT_SYSTEM_PROMPT = "You are an expert email parser. Extract intent and key information accurately."
+
+NEW_LEAD_REPLY_PROMPT = """
+    Generate a WARM, PERSONALIZED email reply for a NEW CUSTOMER:
+    
+    Customer: {name} ({from_email})
+    Subject: {subject}
+    Intent: {intent}
+    Original Message: {content}
+    
+    IMPORTANT: This is a NEW CUSTOMER. Make them feel VERY IMPORTANT and SPECIAL.
+    Use language like "You are very important to us" and "We're thrilled by your interest".
+    Make them feel valued and excited about working with Thryvix AI.
+    
+    Generate a reply that:
+    1. Makes them feel important and valued
+    2. Uses warm, engaging language
+    3. Shows excitement about their interest
+    4. Offers personalized service
+    5. Includes special welcome message
+    
+    Return JSON format:
+    {{
+        "subject": "Welcome to Thryvix AI – You Are Very Important to Us!",
+        "body": "Warm, personalized reply making them feel special",
+        "intent": "{intent}",
+        "next_steps": ["list of next steps"]
+    }}
+    """
+
+EXISTING_CUSTOMER_REPLY_PROMPT = """
+    Generate a professional email reply for an EXISTING CUSTOMER:
+    
+    Customer: {name} ({from_email})
+    Subject: {subject}
+    Intent: {intent}
+    Original Message: {content}
+    
+    This is an EXISTING CUSTOMER. Provide a professional, helpful acknowledgment.
+    
+    Generate a reply that:
+    1. Acknowledges their request professionally
+    2. Is helpful and informative
+    3. Includes appropriate next steps
+    4. Matches the intent (sales, support, partnership, general)
+    
+    Return JSON format:
+    {{
+        "subject": "Re: {subject}",
+        "body": "Professional acknowledgment reply",
+        "intent": "{intent}",
+        "next_steps": ["list of next steps"]
+    }}
+    """
+
+REPLY_SYSTEM_PROMPT = "You are a professional email assistant. Generate helpful, contextually appropriate replies."
+
+# Canned replies used when the LLM is unavailable; filled with str.format per email
+NEW_LEAD_FALLBACK_SUBJECT = "Welcome to Thryvix AI – You Are Very Important to Us!"
+NEW_LEAD_FALLBACK_BODY = "Hi {name},\n\nWe are absolutely thrilled by your interest in Thryvix AI! You are very important to us, and we want to make sure your experience with our products is exceptional.\n\nOur team is excited to work with you and will reach out shortly to provide you with a personalized introduction to our services. We're committed to making you feel valued and ensuring your success.\n\nThank you for choosing Thryvix AI!\n\nWarm regards,\nThe Thryvix AI Team"
+EXISTING_CUSTOMER_FALLBACK_BODIES = {
+    "sales": "Hi {name},\n\nThank you for your interest! Our team will contact you shortly to discuss your requirements.\n\nBest regards,\nThryvix AI Team",
+    "support": "Hi {name},\n\nThank you for reaching out. We've received your support request and will get back to you within 24 hours.\n\nBest regards,\nThryvix AI Support Team",
+}
+EXISTING_CUSTOMER_FALLBACK_BODY = "Hi {name},\n\nThank you for your email. We'll review your message and get back to you soon.\n\nBest regards,\nThryvix AI Team"
+
+@lru_cache(maxsize=1024)
+def _render_fallback_reply(name: str, subject: str, intent: str, is_new_lead: bool) -> Tuple[str, str]:
+    """Render a fallback (subject, body); memoized since LLM outages repeat the same senders"""
+    if is_new_lead:
+        # Special personalized email for new customers
+        return NEW_LEAD_FALLBACK_SUBJECT, NEW_LEAD_FALLBACK_BODY.format(name=name)
+    # Normal acknowledgment for existing customers
+    body = EXISTING_CUSTOMER_FALLBACK_BODIES.get(intent, EXISTING_CUSTOMER_FALLBACK_BODY)
+    return f"Re: {subject}", body.format(name=name)
+
+def _parse_llm_json(text: str) -> Any:
+    """Parse the JSON object in an LLM response, ignoring code fences and surrounding prose"""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        # No object present; let orjson raise a JSONDecodeError for the caller
+        return orjson.loads(text)
+    return orjson.loads(text[start:end + 1])
+
+# Drop the per-instance __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class EmailPayload:
     """Email payload structure"""
     from_email: str
@@ -39,7 +174,7 @@ class EmailPayload:
     subject: str
     email_content: str
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ValidationResult:
     """Validation result from CRM check"""
     validated: bool
@@ -47,7 +182,7 @@ class ValidationResult:
     customer_type: Optional[str] = None
     is_new_lead: bool = True
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReplyResult:
     """Generated reply result"""
     subject: str
@@ -58,45 +193,29 @@ class ParserAgent:
     """Agent for parsing email content and extracting intent"""
     
     def __init__(self):
-        self.intent_keywords = {
-            "sales": ["demo", "pricing", "buy", "purchase", "cost", "price", "interested", "product"],
-            "support": ["help", "issue", "problem", "bug", "error", "not working", "support"],
-            "partnership": ["partnership", "collaborate", "partner", "business", "deal"],
-            "general": ["hello", "hi", "information", "question", "inquiry"]
-        }
+        self.intent_keywords = INTENT_KEYWORDS
     
     async def parse_email(self, email_payload: EmailPayload) -> Dict[str, Any]:
         """Parse email and extract intent"""
         try:
             # Use LLM to extract intent
-            intent_prompt = f"""
-            Analyze this email and determine the primary intent:
-            
-            From: {email_payload.name} ({email_payload.from_email})
-            Subject: {email_payload.subject}
-            Content: {email_payload.email_content}
-            
-            Classify the intent as one of: sales, support, partnership, general
-            Also extract any specific requests or key information.
-            
-            Return JSON format:
-            {{
-                "intent": "sales|support|partnership|general",
-                "confidence": 0.0-1.0,
-                "key_requests": ["list of specific requests"],
-                "urgency": "low|medium|high"
-            }}
-            """
+            intent_prompt = INTENT_PROMPT.format(
+                name=email_payload.name,
+                from_email=email_payload.from_email,
+                subject=email_payload.subject,
+                content=email_payload.email_content
+            )
             
             result = await llm_manager.generate_text(
                 prompt=intent_prompt,
-                system_prompt="You are an expert email parser. Extract intent and key information accurately."
+                system_prompt=INTENT_SYSTEM_PROMPT,
+                extraction=True
             )
             
             if result["success"]:
                 # Parse the JSON response
                 try:
-                    parsed_result = json.loads(result["response"])
+                    parsed_result = _parse_llm_json(result["response"])
                     return {
                         "intent": parsed_result.get("intent", "general"),
                         "confidence": parsed_result.get("confidence", 0.5),
@@ -104,7 +223,7 @@ class ParserAgent:
                         "urgency": parsed_result.get("urgency", "low"),
                         "parsed_successfully": True
                     }
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Fallback to keyword-based parsing
                     return self._fallback_intent_parsing(email_payload)
             else:
@@ -116,17 +235,27 @@ class ParserAgent:
     
     def _fallback_intent_parsing(self, email_payload: EmailPayload) -> Dict[str, Any]:
         """Fallback keyword-based intent parsing"""
-        content_lower = (email_payload.subject + " " + email_payload.email_content).lower()
+        # Track the leader while tallying so no max() pass over the scores is needed;
+        # highest keyword count wins, ties go to the earlier intent in priority order
+        scores = dict.fromkeys(INTENT_KEYWORDS, 0)
+        best_intent, best_score = "general", 0
+        for text in (email_payload.subject, email_payload.email_content):
+            for match in INTENT_RE.finditer(text):
+                intent = match.lastgroup
+                score = scores[intent] = scores[intent] + 1
+                if score > best_score or (
+                    score == best_score and INTENT_PRIORITY[intent] < INTENT_PRIORITY[best_intent]
+                ):
+                    best_intent, best_score = intent, score
         
-        for intent, keywords in self.intent_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
-                return {
-                    "intent": intent,
-                    "confidence": 0.6,
-                    "key_requests": [],
-                    "urgency": "medium",
-                    "parsed_successfully": True
-                }
+        if best_score:
+            return {
+                "intent": best_intent,
+                "confidence": 0.6,
+                "key_requests": [],
+                "urgency": "medium",
+                "parsed_successfully": True
+            }
         
         return {
             "intent": "general",
@@ -136,55 +265,135 @@ class ParserAgent:
             "parsed_successfully": True
         }
 
+# Seconds new leads are held in memory before the CRM file is rewritten, so a
+# burst of new senders costs one write instead of one per email
+CRM_FLUSH_DELAY = 1.0
+
 class ValidationAgent:
     """Agent for validating email against CRM/database"""
     
     def __init__(self):
         self.crm_file = "data/crm/customers.json"
+        self._customers: Optional[List[Dict[str, Any]]] = None
+        self._crm_mtime_ns: Optional[int] = None
+        self._max_id = 0
+        # Lowercased email -> customer record, so lookups are a single hash probe
+        self._email_index: Dict[str, Dict[str, Any]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        # Set when in-memory customers have changes not yet written to disk
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
         self._ensure_crm_file()
     
+    def _get_lock(self) -> asyncio.Lock:
+        """Return the CRM lock, created lazily so it binds to the running loop (Python < 3.10)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
     def _ensure_crm_file(self):
         """Ensure CRM file exists"""
         os.makedirs(os.path.dirname(self.crm_file), exist_ok=True)
         if not os.path.exists(self.crm_file):
-            with open(self.crm_file, 'w') as f:
-                json.dump([], f)
+            with open(self.crm_file, 'wb') as f:
+                f.write(b"[]")
+    
+    def _load_customers(self) -> List[Dict[str, Any]]:
+        """Load CRM customers, reparsing only when the file has changed on disk"""
+        try:
+            mtime_ns = os.stat(self.crm_file).st_mtime_ns
+        except FileNotFoundError:
+            # Removed at runtime: recreate it empty (pending leads still win below)
+            self._ensure_crm_file()
+            mtime_ns = os.stat(self.crm_file).st_mtime_ns
+        # Unflushed leads would be lost by a reparse, so the in-memory copy wins while dirty
+        if self._customers is None or (not self._dirty and mtime_ns != self._crm_mtime_ns):
+            with open(self.crm_file, 'rb') as f:
+                self._customers = orjson.loads(f.read())
+            self._crm_mtime_ns = mtime_ns
+            self._max_id = max((customer.get("id") or 0 for customer in self._customers), default=0)
+            self._email_index = {}
+            for customer in self._customers:
+                # First record wins, matching the order a linear scan would find
+                self._email_index.setdefault(customer.get("email", "").lower(), customer)
+        return self._customers
+    
+    async def get_customers(self) -> List[Dict[str, Any]]:
+        """Return CRM customers from the mtime-checked cache, including unflushed leads"""
+        async with self._get_lock():
+            return list(await asyncio.to_thread(self._load_customers))
+    
+    def _save_customers(self, customers: List[Dict[str, Any]]):
+        """Write the CRM file and record its mtime so our own write isn't reparsed"""
+        # Write to a temp file and swap it in, so readers never see a torn file
+        tmp_file = f"{self.crm_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(customers, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.crm_file)
+        self._crm_mtime_ns = os.stat(self.crm_file).st_mtime_ns
+    
+    async def _flush_later(self):
+        """Write pending CRM changes once the debounce delay has passed"""
+        await asyncio.sleep(CRM_FLUSH_DELAY)
+        self._flush_task = None
+        await self.flush()
+    
+    async def flush(self):
+        """Write pending CRM changes to disk now; call on shutdown"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        async with self._get_lock():
+            if not self._dirty:
+                return
+            try:
+                await asyncio.to_thread(self._save_customers, self._customers)
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Error saving CRM file: {e}")
     
     async def validate_email(self, email_payload: EmailPayload) -> ValidationResult:
         """Validate email against CRM database"""
         try:
-            # Load existing customers
-            with open(self.crm_file, 'r') as f:
-                customers = json.load(f)
+            email_lower = email_payload.from_email.lower()
             
-            # Check if email exists
-            for customer in customers:
-                if customer.get("email", "").lower() == email_payload.from_email.lower():
+            # CRM file I/O runs off the event loop; the lock keeps a concurrent
+            # email from the same sender from being added twice while we wait
+            async with self._get_lock():
+                customers = await asyncio.to_thread(self._load_customers)
+                
+                # Check if email exists
+                customer = self._email_index.get(email_lower)
+                if customer is not None:
                     return ValidationResult(
                         validated=True,
                         user_id=customer.get("id"),
                         customer_type=customer.get("type", "existing"),
                         is_new_lead=False
                     )
-            
-            # New lead - add to CRM
-            new_customer_id = len(customers) + 1
-            new_customer = {
-                "id": new_customer_id,
-                "name": email_payload.name,
-                "email": email_payload.from_email,
-                "type": "new_lead",
-                "status": "New Lead",
-                "account_id": None,
-                "created_at": datetime.now().isoformat(),
-                "last_contact": datetime.now().isoformat()
-            }
-            
-            customers.append(new_customer)
-            
-            # Save updated CRM
-            with open(self.crm_file, 'w') as f:
-                json.dump(customers, f, indent=2)
+                
+                # New lead - add to CRM
+                self._max_id += 1
+                new_customer_id = self._max_id
+                now = datetime.now().isoformat()
+                new_customer = {
+                    "id": new_customer_id,
+                    "name": email_payload.name,
+                    "email": email_payload.from_email,
+                    "type": "new_lead",
+                    "status": "New Lead",
+                    "account_id": None,
+                    "created_at": now,
+                    "last_contact": now
+                }
+                
+                customers.append(new_customer)
+                self._email_index[email_lower] = new_customer
+                
+                # Mark dirty and schedule a debounced save rather than rewriting now
+                self._dirty = True
+                if self._flush_task is None:
+                    self._flush_task = asyncio.create_task(self._flush_later())
             
             return ValidationResult(
                 validated=True,
@@ -203,77 +412,36 @@ class ReplyGeneratorAgent:
     async def generate_reply(self, email_payload: EmailPayload, intent: str, customer_type: str, is_new_lead: bool) -> ReplyResult:
         """Generate appropriate reply based on intent and customer type"""
         try:
+            prompt_fields = {
+                "name": email_payload.name,
+                "from_email": email_payload.from_email,
+                "subject": email_payload.subject,
+                "intent": intent,
+                "content": email_payload.email_content
+            }
+            
             # Different prompts for existing vs new customers
             if is_new_lead:
                 # Special personalized email for new customers
-                reply_prompt = f"""
-                Generate a WARM, PERSONALIZED email reply for a NEW CUSTOMER:
-                
-                Customer: {email_payload.name} ({email_payload.from_email})
-                Subject: {email_payload.subject}
-                Intent: {intent}
-                Original Message: {email_payload.email_content}
-                
-                IMPORTANT: This is a NEW CUSTOMER. Make them feel VERY IMPORTANT and SPECIAL.
-                Use language like "You are very important to us" and "We're thrilled by your interest".
-                Make them feel valued and excited about working with Thryvix AI.
-                
-                Generate a reply that:
-                1. Makes them feel important and valued
-                2. Uses warm, engaging language
-                3. Shows excitement about their interest
-                4. Offers personalized service
-                5. Includes special welcome message
-                
-                Return JSON format:
-                {{
-                    "subject": "Welcome to Thryvix AI – You Are Very Important to Us!",
-                    "body": "Warm, personalized reply making them feel special",
-                    "intent": "{intent}",
-                    "next_steps": ["list of next steps"]
-                }}
-                """
+                reply_prompt = NEW_LEAD_REPLY_PROMPT.format(**prompt_fields)
             else:
                 # Normal acknowledgment for existing customers
-                reply_prompt = f"""
-                Generate a professional email reply for an EXISTING CUSTOMER:
-                
-                Customer: {email_payload.name} ({email_payload.from_email})
-                Subject: {email_payload.subject}
-                Intent: {intent}
-                Original Message: {email_payload.email_content}
-                
-                This is an EXISTING CUSTOMER. Provide a professional, helpful acknowledgment.
-                
-                Generate a reply that:
-                1. Acknowledges their request professionally
-                2. Is helpful and informative
-                3. Includes appropriate next steps
-                4. Matches the intent (sales, support, partnership, general)
-                
-                Return JSON format:
-                {{
-                    "subject": "Re: {email_payload.subject}",
-                    "body": "Professional acknowledgment reply",
-                    "intent": "{intent}",
-                    "next_steps": ["list of next steps"]
-                }}
-                """
+                reply_prompt = EXISTING_CUSTOMER_REPLY_PROMPT.format(**prompt_fields)
             
             result = await llm_manager.generate_text(
                 prompt=reply_prompt,
-                system_prompt="You are a professional email assistant. Generate helpful, contextually appropriate replies."
+                system_prompt=REPLY_SYSTEM_PROMPT
             )
             
             if result["success"]:
                 try:
-                    parsed_reply = json.loads(result["response"])
+                    parsed_reply = _parse_llm_json(result["response"])
                     return ReplyResult(
                         subject=parsed_reply.get("subject", f"Re: {email_payload.subject}"),
                         body=parsed_reply.get("body", "Thank you for your email. We'll get back to you soon."),
                         intent=intent
                     )
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     return self._fallback_reply(email_payload, intent, is_new_lead)
             else:
                 return self._fallback_reply(email_payload, intent, is_new_lead)
@@ -284,33 +452,9 @@ class ReplyGeneratorAgent:
     
     def _fallback_reply(self, email_payload: EmailPayload, intent: str, is_new_lead: bool) -> ReplyResult:
         """Fallback reply generation"""
-        if is_new_lead:
-            # Special personalized email for new customers
-            return ReplyResult(
-                subject="Welcome to Thryvix AI – You Are Very Important to Us!",
-                body=f"Hi {email_payload.name},\n\nWe are absolutely thrilled by your interest in Thryvix AI! You are very important to us, and we want to make sure your experience with our products is exceptional.\n\nOur team is excited to work with you and will reach out shortly to provide you with a personalized introduction to our services. We're committed to making you feel valued and ensuring your success.\n\nThank you for choosing Thryvix AI!\n\nWarm regards,\nThe Thryvix AI Team",
-                intent=intent
-            )
-        else:
-            # Normal acknowledgment for existing customers
-            if intent == "sales":
-                return ReplyResult(
-                    subject=f"Re: {email_payload.subject}",
-                    body=f"Hi {email_payload.name},\n\nThank you for your interest! Our team will contact you shortly to discuss your requirements.\n\nBest regards,\nThryvix AI Team",
-                    intent=intent
-                )
-            elif intent == "support":
-                return ReplyResult(
-                    subject=f"Re: {email_payload.subject}",
-                    body=f"Hi {email_payload.name},\n\nThank you for reaching out. We've received your support request and will get back to you within 24 hours.\n\nBest regards,\nThryvix AI Support Team",
-                    intent=intent
-                )
-            else:
-                return ReplyResult(
-                    subject=f"Re: {email_payload.subject}",
-                    body=f"Hi {email_payload.name},\n\nThank you for your email. We'll review your message and get back to you soon.\n\nBest regards,\nThryvix AI Team",
-                    intent=intent
-                )
+        # Cached strings are immutable; each call still gets its own ReplyResult
+        subject, body = _render_fallback_reply(email_payload.name, email_payload.subject, intent, is_new_lead)
+        return ReplyResult(subject=subject, body=body, intent=intent)
 
 class LoggingAgent:
     """Agent for logging email interactions"""
@@ -320,6 +464,8 @@ class LoggingAgent:
         self.existing_leads_dir = "data/existing_leads"
         os.makedirs(self.new_leads_dir, exist_ok=True)
         os.makedirs(self.existing_leads_dir, exist_ok=True)
+        # Keeps log filenames unique when one sender emails twice within a second
+        self._sequence = itertools.count()
     
     async def log_interaction(self, 
                             email_payload: EmailPayload, 
@@ -328,14 +474,16 @@ class LoggingAgent:
                             intent: str) -> str:
         """Log email interaction to appropriate folder"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{email_payload.from_email.replace('@', '_at_')}.json"
+            # Read the clock once and reuse it for the filename and both timestamps
+            now = datetime.now()
+            created_at = now.isoformat()
+            filename = f"{now:%Y%m%d_%H%M%S}_{next(self._sequence)}_{email_payload.from_email.replace('@', '_at_')}.json"
             
             # Determine folder based on whether it's a new lead
             folder = self.new_leads_dir if validation_result.is_new_lead else self.existing_leads_dir
             
             log_entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": created_at,
                 "email": {
                     "from": email_payload.from_email,
                     "name": email_payload.name,
@@ -355,20 +503,25 @@ class LoggingAgent:
                 },
                 "processing": {
                     "intent": intent,
-                    "processed_at": datetime.now().isoformat()
+                    "processed_at": created_at
                 }
             }
             
             filepath = os.path.join(folder, filename)
-            with open(filepath, 'w') as f:
-                json.dump(log_entry, f, indent=2)
+            # Disk write runs on a worker thread so the event loop keeps serving
+            await asyncio.to_thread(self._write_log, filepath, log_entry)
             
-            logger.info(f"Logged interaction to {filepath}")
+            logger.info("Logged interaction to %s", filepath)
             return filepath
             
         except Exception as e:
             logger.error(f"Error in LoggingAgent: {e}")
             return ""
+    
+    def _write_log(self, filepath: str, log_entry: Dict[str, Any]):
+        """Write one interaction log file"""
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(log_entry, option=orjson.OPT_INDENT_2))
 
 class EmailWorkflow:
     """Main email processing workflow"""
@@ -379,6 +532,10 @@ class EmailWorkflow:
         self.reply_generator = ReplyGeneratorAgent()
         self.logging_agent = LoggingAgent()
     
+    async def aclose(self):
+        """Flush state held in memory by the agents; call on shutdown"""
+        await self.validation_agent.flush()
+    
     async def process_email(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process complete email workflow"""
         try:
@@ -390,15 +547,15 @@ class EmailWorkflow:
                 email_content=email_data["email"]["Email_Content"]
             )
             
-            logger.info(f"Processing email from {email_payload.name} ({email_payload.from_email})")
+            logger.info("Processing email from %s (%s)", email_payload.name, email_payload.from_email)
             
-            # Step 1: Parse email and extract intent
-            parse_result = await self.parser_agent.parse_email(email_payload)
+            # Step 1 & 2: Parse intent and validate against CRM concurrently (independent)
+            parse_result, validation_result = await asyncio.gather(
+                self.parser_agent.parse_email(email_payload),
+                self.validation_agent.validate_email(email_payload)
+            )
             intent = parse_result["intent"]
             
-            # Step 2: Validate against CRM
-            validation_result = await self.validation_agent.validate_email(email_payload)
-            
             # Step 3: Generate reply
             reply_result = await self.reply_generator.generate_reply(
                 email_payload, intent, validation_result.customer_type or "unknown", validation_result.is_new_lead
@@ -21,7 +21,11 @@ Advanced AI agents that:
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Union
+import hashlib
+import re
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain.tools import Tool
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -35,8 +39,192 @@ from langchain_anthropic import ChatAnthropic
 
 from config.settings import settings
 from agents.llm_manager import llm_manager
+from agents.ai_provider_manager import ai_provider_manager
+from models.schemas import AIProvider
 from utils.logger import logger
 
+# Email analysis keywords by category; one alternation finds every category in a
+# single pass, and re.IGNORECASE avoids lowercasing a copy of the email
+_KEYWORD_CATEGORIES = {
+    "greeting": ("hello", "hi", "dear", "good morning"),
+    "urgent": ("urgent", "asap", "immediately", "critical"),
+}
+_KEYWORD_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        f"(?P<{category}>{'|'.join(map(re.escape, words))})"
+        for category, words in _KEYWORD_CATEGORIES.items()
+    ) + r')\b',
+    re.IGNORECASE
+)
+_WORD_RE = re.compile(r'\S+')
+
+# Sender extraction patterns, compiled once at import; bounded widths keep
+# backtracking linear on long lines with no '<'
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b')
+_NAME_RES = tuple(
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'From:\s*([^<\n]{1,200})',
+        r'Sender:\s*([^<\n]{1,200})',
+        r'^([^<\n]{1,200})\s*<[^>\n]{1,320}>',
+    )
+)
+
+# Tools only look at the first 32 KB of an email
+MAX_TOOL_INPUT_CHARS = 32_768
+
+def _keyword_hits(text: str) -> set:
+    """Return the keyword categories present in text, stopping once all are found."""
+    hits = set()
+    for match in _KEYWORD_RE.finditer(text):
+        hits.add(match.lastgroup)
+        if len(hits) == len(_KEYWORD_CATEGORIES):
+            break
+    return hits
+
+def _word_count(text: str) -> int:
+    """Count whitespace-separated words without building a list of them."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+# Email processing agent prompt, parsed once and shared by every agent instance
+_EMAIL_AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert email processing assistant. Your role is to:
+    1. Analyze incoming emails to understand their content and context
+    2. Extract sender information accurately
+    3. Generate appropriate, professional responses
+    4. Use the available tools to gather information and generate responses
+    
+    Always be professional, helpful, and contextually appropriate in your responses.
+    Use the tools available to you to gather information before generating responses.
+    Call all relevant tools in a single response rather than one at a time."""),
+    ("human", "{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad"),
+])
+
+# Tool results for the current orchestrator request, keyed on (tool name, args digest)
+_tool_call_cache: ContextVar[Optional[Dict[Tuple[str, bytes], str]]] = ContextVar(
+    "_tool_call_cache", default=None
+)
+
+def _tool_call_key(name: str, *args: str) -> Tuple[str, bytes]:
+    """Build the dedup key for a tool call from its name and string arguments."""
+    digest = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        digest.update(arg.encode())
+        digest.update(b"\0")
+    return name, digest.digest()
+
+@lru_cache(maxsize=1024)
+def _analyze_email(email_content: str) -> str:
+    """Analyze email content; memoized so repeated bodies skip the regex scans."""
+    hits = _keyword_hits(email_content)
+    analysis = {
+        "word_count": _word_count(email_content),
+        "has_greeting": "greeting" in hits,
+        "has_question": "?" in email_content,
+        "urgency_indicators": "urgent" in hits,
+        "sentiment": "neutral"  # Could be enhanced with sentiment analysis
+    }
+    return f"Email Analysis: {analysis}"
+
+@lru_cache(maxsize=1024)
+def _extract_sender(email_content: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (sender_name, email_address); memoized like _analyze_email."""
+    # Extract email address
+    email_match = _EMAIL_RE.search(email_content)
+    email_address = email_match.group(0) if email_match else None
+    
+    # Extract name patterns
+    for pattern in _NAME_RES:
+        match = pattern.search(email_content)
+        if match:
+            return match.group(1).strip(), email_address
+    return None, email_address
+
+# Prompt templates, built once; filled with str.format per call
+_AGENT_INPUT_PROMPT = """
+    Please process this email:
+    
+    {email_content}
+    
+    Steps:
+    1. Analyze the email content
+    2. Extract sender information
+    3. Generate an appropriate response
+    """
+
+_RESPONSE_GENERATION_PROMPT = """
+    You are a professional email assistant responding to {sender_name}.
+    
+    CONTEXT:
+    - Sender: {sender_name}
+    - Urgency: {urgency}
+    - Topics: {topics}
+    - Previous interactions: {history}
+    
+    TASK: Generate a professional, helpful email response.
+    
+    GUIDELINES:
+    - Be polite and professional
+    - Address their specific concerns
+    - Keep the response concise but complete
+    - Match the urgency level appropriately
+    - Use a warm but professional tone
+    
+    RESPONSE REQUIREMENTS:
+    - Start with appropriate greeting
+    - Acknowledge their message
+    - Address their concerns
+    - Provide next steps or information
+    - End with professional closing
+    
+    Generate the response now:
+    """
+
+_PROMPT_OPTIMIZATION_PROMPT = """
+    You are a prompt engineering expert. Optimize the following prompt for {task_type}:
+    
+    ORIGINAL PROMPT:
+    {original_prompt}
+    
+    OPTIMIZATION REQUIREMENTS:
+    - Make it more specific and clear
+    - Add examples if helpful
+    - Improve structure and flow
+    - Ensure it follows best practices
+    - Maintain the original intent
+    
+    Provide the optimized prompt:
+    """
+
+@lru_cache(maxsize=32)
+def _email_extraction_prompt(context: str) -> str:
+    """Build the email extraction prompt; memoized per context string."""
+    return f"""
+    You are an expert email parser with the following context: {context}
+    
+    TASK: Extract sender information from the email content below.
+    
+    REQUIREMENTS:
+    - Extract the sender's full name (if available)
+    - Extract the sender's email address (if available)
+    - Identify the email subject/topic
+    - Determine the urgency level (low, medium, high)
+    - Extract key topics or concerns mentioned
+    
+    OUTPUT FORMAT:
+    {{
+        "sender_name": "extracted name or null",
+        "sender_email": "extracted email or null",
+        "subject": "email subject or null",
+        "urgency": "low/medium/high",
+        "topics": ["topic1", "topic2", ...],
+        "confidence": 0.0-1.0
+    }}
+    
+    EMAIL CONTENT:
+    """
+
 class EmailAnalysisTool(BaseTool):
     """Tool for analyzing email content and extracting key information."""
     
@@ -44,27 +232,18 @@ class EmailAnalysisTool(BaseTool):
     description: str = "Analyze email content to extract sender information, sentiment, and key topics"
     
     def _run(self, email_content: str) -> str:
-        """Synchronous version of the tool."""
-        return asyncio.run(self._arun(email_content))
-    
-    async def _arun(self, email_content: str) -> str:
-        """Analyze email content asynchronously."""
-        # =============== start _arun ======
+        """Analyze email content (pure Python, no await points)."""
+        # =============== start _run ======
         try:
-            # Extract basic information
-            analysis = {
-                "word_count": len(email_content.split()),
-                "has_greeting": any(greeting in email_content.lower() for greeting in ["hello", "hi", "dear", "good morning"]),
-                "has_question": "?" in email_content,
-                "urgency_indicators": ["urgent", "asap", "immediately", "critical"] in email_content.lower(),
-                "sentiment": "neutral"  # Could be enhanced with sentiment analysis
-            }
-            
-            return f"Email Analysis: {analysis}"
+            return _analyze_email(email_content[:MAX_TOOL_INPUT_CHARS])
             
         except Exception as e:
             logger.error(f"Error in email analysis: {e}")
             return f"Analysis failed: {str(e)}"
+    
+    async def _arun(self, email_content: str) -> str:
+        """Analyze email content asynchronously."""
+        return self._run(email_content)
 
 class SenderExtractionTool(BaseTool):
     """Tool for extracting sender information from emails."""
@@ -73,38 +252,19 @@ class SenderExtractionTool(BaseTool):
     description: str = "Extract sender name and email address from email content"
     
     def _run(self, email_content: str) -> str:
-        """Synchronous version of the tool."""
-        return asyncio.run(self._arun(email_content))
-    
-    async def _arun(self, email_content: str) -> str:
-        """Extract sender information asynchronously."""
+        """Extract sender information (pure Python, no await points)."""
+        # =============== start _run ======
         try:
-            import re
-            
-            # Extract email address
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            email_match = re.search(email_pattern, email_content)
-            email_address = email_match.group(0) if email_match else "Not found"
-            
-            # Extract name patterns
-            name_patterns = [
-                r'From:\s*([^<\n]+)',
-                r'Sender:\s*([^<\n]+)',
-                r'^([^<\n]+)\s*<[^>]+>',
-            ]
-            
-            sender_name = "Not found"
-            for pattern in name_patterns:
-                match = re.search(pattern, email_content, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    sender_name = match.group(1).strip()
-                    break
-            
-            return f"Sender: {sender_name}, Email: {email_address}"
+            sender_name, email_address = _extract_sender(email_content[:MAX_TOOL_INPUT_CHARS])
+            return f"Sender: {sender_name or 'Not found'}, Email: {email_address or 'Not found'}"
             
         except Exception as e:
             logger.error(f"Error in sender extraction: {e}")
             return f"Extraction failed: {str(e)}"
+    
+    async def _arun(self, email_content: str) -> str:
+        """Extract sender information asynchronously."""
+        return self._run(email_content)
 
 class ResponseGeneratorTool(BaseTool):
     """Tool for generating contextual email responses."""
@@ -113,11 +273,26 @@ class ResponseGeneratorTool(BaseTool):
     description: str = "Generate appropriate email responses based on content and context"
     
     def _run(self, email_content: str, sender_name: str = "there") -> str:
-        """Synchronous version of the tool."""
-        return asyncio.run(self._arun(email_content, sender_name))
+        """Synchronous version of the tool; prefer _arun inside an event loop."""
+        # =============== start _run ======
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop in this thread: bootstrapping one is the last resort
+            return asyncio.run(self._arun(email_content, sender_name))
+        
+        # Blocking on a nested loop would deadlock the running one
+        raise RuntimeError("use _arun inside an event loop")
     
     async def _arun(self, email_content: str, sender_name: str = "there") -> str:
         """Generate response asynchronously."""
+        # =============== start _arun ======
+        # Within one orchestrator request, a repeated call with the same args is answered once
+        call_cache = _tool_call_cache.get()
+        key = _tool_call_key(self.name, email_content, sender_name)
+        if call_cache is not None and key in call_cache:
+            return call_cache[key]
+        
         try:
             # Use AI provider manager to generate response
             response = await ai_provider_manager.generate_reply(
@@ -126,6 +301,8 @@ class ResponseGeneratorTool(BaseTool):
                 provider=AIProvider.OPENAI
             )
             
+            if call_cache is not None:
+                call_cache[key] = response
             return response
             
         except Exception as e:
@@ -137,29 +314,11 @@ class EmailProcessingAgent:
     
     def __init__(self, provider: AIProvider = AIProvider.OPENAI):
         """Initialize the email processing agent."""
-        self.provider = provider
-        self.llm = ai_provider_manager.get_provider(provider)
-        
-        # Check if provider is available
-        if not self.llm:
-            available_providers = ai_provider_manager.get_available_providers()
-            if available_providers:
-                # Use the first available provider
-                self.provider = available_providers[0]
-                self.llm = ai_provider_manager.get_provider(self.provider)
-                logger.warning(f"Requested provider {provider.value} not available, using {self.provider.value}")
-            else:
-                logger.error("No AI providers available. Please configure API keys in .env file")
-                raise ValueError("No AI providers available. Please configure API keys in .env file")
+        self.provider, self.llm = ai_provider_manager.resolve(provider)
         
         self.tools = self._create_tools()
+        # The agent runnable is stateless; executors are built per call in process_email
         self.agent = self._create_agent()
-        self.agent_executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=True,
-            max_iterations=5
-        )
     
     def _create_tools(self) -> List[BaseTool]:
         """Create tools for the agent."""
@@ -169,42 +328,33 @@ class EmailProcessingAgent:
             ResponseGeneratorTool()
         ]
     
+    def _create_executor(self) -> AgentExecutor:
+        """Create a fresh executor so concurrent calls share no run state."""
+        return AgentExecutor(
+            agent=self.agent,
+            tools=self.tools,
+            verbose=settings.debug,
+            max_iterations=5
+        )
+    
     def _create_agent(self):
         """Create the agent with prompt template."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert email processing assistant. Your role is to:
-            1. Analyze incoming emails to understand their content and context
-            2. Extract sender information accurately
-            3. Generate appropriate, professional responses
-            4. Use the available tools to gather information and generate responses
-            
-            Always be professional, helpful, and contextually appropriate in your responses.
-            Use the tools available to you to gather information before generating responses."""),
-            ("human", "{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"),
-        ])
+        # create_openai_tools_agent binds the tools itself; bind() merges kwargs,
+        # so OpenAI can return every tool call in one turn
+        llm = self.llm
+        if self.provider == AIProvider.OPENAI:
+            llm = llm.bind(parallel_tool_calls=True)
         
-        return create_openai_tools_agent(self.llm, self.tools, prompt)
+        return create_openai_tools_agent(llm, self.tools, _EMAIL_AGENT_PROMPT)
     
     async def process_email(self, email_content: str) -> Dict[str, Any]:
         """Process email using the agent."""
         try:
             # Create input for the agent
-            agent_input = f"""
-            Please process this email:
-            
-            {email_content}
-            
-            Steps:
-            1. Analyze the email content
-            2. Extract sender information
-            3. Generate an appropriate response
-            """
+            agent_input = _AGENT_INPUT_PROMPT.format(email_content=email_content)
             
             # Execute the agent
-            result = await self.agent_executor.ainvoke({
-                "input": agent_input
-            })
+            result = await self._create_executor().ainvoke({"input": agent_input})
             
             return {
                 "success": True,
@@ -219,101 +369,67 @@ class EmailProcessingAgent:
                 "error": str(e),
                 "provider": self.provider.value
             }
+    
+    async def process_email_fast(self, email_content: str) -> Dict[str, Any]:
+        """Process email with the fixed analyze -> extract -> reply plan, skipping the executor."""
+        # =============== start process_email_fast ======
+        try:
+            analysis_tool, sender_tool, response_tool = self.tools
+            
+            # Both tools are pure CPU with no await points, so call them directly
+            analysis = analysis_tool._run(email_content)
+            sender = sender_tool._run(email_content)
+            
+            # Memoized, so this reuses the scan the sender tool just did
+            sender_name = _extract_sender(email_content[:MAX_TOOL_INPUT_CHARS])[0] or "there"
+            
+            # One LLM call for the reply
+            response = await response_tool._arun(email_content, sender_name)
+            
+            return {
+                "success": True,
+                "result": {
+                    "analysis": analysis,
+                    "sender": sender,
+                    "output": response
+                },
+                "provider": self.provider.value
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in fast email processing: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "provider": self.provider.value
+            }
 
 class PromptEngineeringAgent:
     """Agent specialized in prompt engineering and optimization."""
     
     def __init__(self, provider: AIProvider = AIProvider.OPENAI):
         """Initialize the prompt engineering agent."""
-        self.provider = provider
-        self.llm = ai_provider_manager.get_provider(provider)
-        
-        # Check if provider is available
-        if not self.llm:
-            available_providers = ai_provider_manager.get_available_providers()
-            if available_providers:
-                # Use the first available provider
-                self.provider = available_providers[0]
-                self.llm = ai_provider_manager.get_provider(self.provider)
-                logger.warning(f"Requested provider {provider.value} not available, using {self.provider.value}")
-            else:
-                logger.error("No AI providers available. Please configure API keys in .env file")
-                raise ValueError("No AI providers available. Please configure API keys in .env file")
+        self.provider, self.llm = ai_provider_manager.resolve(provider)
     
     def create_email_extraction_prompt(self, context: str = "") -> str:
         """Create optimized prompt for email extraction."""
-        return f"""
-        You are an expert email parser with the following context: {context}
-        
-        TASK: Extract sender information from the email content below.
-        
-        REQUIREMENTS:
-        - Extract the sender's full name (if available)
-        - Extract the sender's email address (if available)
-        - Identify the email subject/topic
-        - Determine the urgency level (low, medium, high)
-        - Extract key topics or concerns mentioned
-        
-        OUTPUT FORMAT:
-        {{
-            "sender_name": "extracted name or null",
-            "sender_email": "extracted email or null",
-            "subject": "email subject or null",
-            "urgency": "low/medium/high",
-            "topics": ["topic1", "topic2", ...],
-            "confidence": 0.0-1.0
-        }}
-        
-        EMAIL CONTENT:
-        """
+        return _email_extraction_prompt(context)
     
     def create_response_generation_prompt(self, sender_name: str, context: Dict[str, Any]) -> str:
         """Create optimized prompt for response generation."""
-        return f"""
-        You are a professional email assistant responding to {sender_name}.
-        
-        CONTEXT:
-        - Sender: {sender_name}
-        - Urgency: {context.get('urgency', 'medium')}
-        - Topics: {', '.join(context.get('topics', []))}
-        - Previous interactions: {context.get('history', 'none')}
-        
-        TASK: Generate a professional, helpful email response.
-        
-        GUIDELINES:
-        - Be polite and professional
-        - Address their specific concerns
-        - Keep the response concise but complete
-        - Match the urgency level appropriately
-        - Use a warm but professional tone
-        
-        RESPONSE REQUIREMENTS:
-        - Start with appropriate greeting
-        - Acknowledge their message
-        - Address their concerns
-        - Provide next steps or information
-        - End with professional closing
-        
-        Generate the response now:
-        """
+        return _RESPONSE_GENERATION_PROMPT.format(
+            sender_name=sender_name,
+            urgency=context.get('urgency', 'medium'),
+            topics=', '.join(context.get('topics', [])),
+            history=context.get('history', 'none')
+        )
     
     async def optimize_prompt(self, original_prompt: str, task_type: str) -> str:
         """Optimize a prompt for better performance."""
-        optimization_prompt = f"""
-        You are a prompt engineering expert. Optimize the following prompt for {task_type}:
-        
-        ORIGINAL PROMPT:
-        {original_prompt}
-        
-        OPTIMIZATION REQUIREMENTS:
-        - Make it more specific and clear
-        - Add examples if helpful
-        - Improve structure and flow
-        - Ensure it follows best practices
-        - Maintain the original intent
-        
-        Provide the optimized prompt:
-        """
+        optimization_prompt = _PROMPT_OPTIMIZATION_PROMPT.format(
+            task_type=task_type,
+            original_prompt=original_prompt
+        )
         
         try:
             response = await self.llm.ainvoke([HumanMessage(content=optimization_prompt)])
@@ -338,9 +454,16 @@ class MultiAgentOrchestrator:
         use_optimized_prompts: bool = True
     ) -> Dict[str, Any]:
         """Process email using multiple agents."""
+        # Request-scoped tool call dedup; tasks created below inherit this dict
+        cache_token = _tool_call_cache.set({})
         try:
             results = {}
             
+            # Start email processing first; prompt building below is independent of it
+            processing_task = asyncio.create_task(
+                self.agents["email_processor"].process_email(email_content)
+            )
+            
             # Step 1: Use prompt engineering agent to create optimized prompts
             if use_optimized_prompts:
                 extraction_prompt = self.agents["prompt_engineer"].create_email_extraction_prompt()
@@ -352,8 +475,8 @@ class MultiAgentOrchestrator:
                     "response": response_prompt
                 }
             
-            # Step 2: Use email processing agent
-            processing_result = await self.agents["email_processor"].process_email(email_content)
+            # Step 2: Collect the email processing agent result
+            processing_result = await processing_task
             results["processing"] = processing_result
             
             # Step 3: Generate final response
@@ -367,7 +490,7 @@ class MultiAgentOrchestrator:
                     provider=AIProvider.OPENAI
                 )
                 
-                results["final_response"] = final_response.dict()
+                results["final_response"] = final_response.model_dump()
             
             return {
                 "success": True,
@@ -382,37 +505,36 @@ class MultiAgentOrchestrator:
                 "error": str(e),
                 "agents_used": list(self.agents.keys())
             }
+        finally:
+            _tool_call_cache.reset(cache_token)
     
     async def batch_process_with_agents(
         self,
         emails: List[Dict[str, Any]],
-        use_optimized_prompts: bool = True
+        use_optimized_prompts: bool = True,
+        max_concurrency: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Process multiple emails using agents."""
-        tasks = []
-        
-        for email in emails:
-            task = self.process_email_with_agents(
-                email.get("content", ""),
-                use_optimized_prompts
-            )
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        """Process multiple emails using agents, at most max_concurrency at a time."""
+        # =============== start batch_process_with_agents ======
+        semaphore = asyncio.Semaphore(max_concurrency or settings.batch_max_concurrency)
+        processed_results: List[Optional[Dict[str, Any]]] = [None] * len(emails)
         
-        # Handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Error processing email {i} with agents: {result}")
-                processed_results.append({
-                    "error": str(result),
-                    "email": emails[i],
-                    "success": False
-                })
-            else:
-                processed_results.append(result)
+        async def guarded(i: int, email: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    processed_results[i] = await self.process_email_with_agents(
+                        email.get("content", ""),
+                        use_optimized_prompts
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing email {i} with agents: {e}")
+                    processed_results[i] = {
+                        "error": str(e),
+                        "email": email,
+                        "success": False
+                    }
         
+        await asyncio.gather(*(guarded(i, email) for i, email in enumerate(emails)))
         return processed_results
 
 # Global agent instances - only create if providers are available
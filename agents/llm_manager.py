@@ -9,114 +9,177 @@ Support: yonteru.ai.engineer@gmail.com
 Description:
 ------------
 Simple LLM Manager with fallback logic.
-Initializes all available LLM models at once and provides fallback functionality.
+Registers all available LLM models and provides fallback functionality.
 
 Main Use:
 ---------
 Centralized LLM management that:
-1. Initializes all available LLM models at startup
+1. Registers all available LLM models at startup, building clients on first use
 2. Provides fallback logic - if one LLM fails, try another
-3. Uses only LangChain's built-in caching
+3. Uses only LangChain's built-in (SQLite-backed) caching
 4. Simple interface for text generation
 """
 
 import asyncio
 import time
 from typing import Dict, Any, Optional, List
+import httpx
+import orjson
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_community.cache import InMemoryCache
-from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 
 from config.settings import settings
+from utils.email_parser import EmailParser
 from utils.logger import logger
 
-# Set up LangChain's built-in caching
-set_llm_cache(InMemoryCache())
+# Model used for each provider, online and through the batch APIs
+MODEL_NAMES = {
+    "openai": "gpt-3.5-turbo",
+    "groq": "llama3-8b-8192",
+    "google": "gemini-pro",
+    "anthropic": "claude-3-sonnet-20240229"
+}
+
+# Replies are sampled; extraction (sender names, intents) is run deterministically
+REPLY_TEMPERATURE = 0.7
+EXTRACTION_TEMPERATURE = 0.0
+
+# System prompts, built once; the reply prompt is filled with str.format per email
+EMAIL_REPLY_SYSTEM_PROMPT = """You are a professional email assistant. Generate a helpful, 
+concise reply to {sender_name}. Be polite, professional, and address their concerns appropriately.
+Keep the response brief and to the point."""
+
+SENDER_NAME_SYSTEM_PROMPT = """You are an expert email parser. Extract the sender's name from the email content. 
+Return only the name, nothing else. If no clear name is found, return 'Unknown'."""
+
+def _build_llm_cache():
+    """Pick the LangChain LLM cache: Redis when configured (shared by workers), else SQLite."""
+    if settings.redis_url:
+        try:
+            # Clients connect lazily, so check the server now; otherwise an
+            # unreachable Redis fails every cached model call instead of falling back
+            from redis import Redis
+            redis_client = Redis.from_url(settings.redis_url, socket_connect_timeout=2)
+            redis_client.ping()
+            
+            # Exact-match only: prompts embed the customer's name and email, so a
+            # similarity hit could replay one customer's answer to another
+            from langchain_community.cache import RedisCache
+            cache = RedisCache(redis_=redis_client)
+            logger.info("Using Redis LLM cache")
+            return cache
+        except Exception as e:
+            logger.warning(f"Redis LLM cache unavailable, falling back to SQLite: {e}")
+    
+    return SQLiteCache(database_path=settings.llm_cache_path)
+
+# Persistent LangChain cache, attached only to the deterministic extraction
+# models; sampled replies are never replayed, so it is not set globally
+LLM_CACHE = _build_llm_cache()
 
 class LLMManager:
     """Simple LLM Manager with fallback logic."""
     
     def __init__(self):
-        """Initialize all available LLM models."""
-        self.models = {}
+        """Register all available LLM models."""
+        self.models = {}  # (name, extraction) -> constructed model, filled lazily by _get_model
+        self._factories = {}
         self.model_order = []  # Order to try models in case of failure
+        # One keep-alive HTTP/2 pool shared by the OpenAI and Groq clients
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        # Provider SDK clients for the offline batch APIs, built on first use
+        self._batch_clients = {}
+        self._batch_providers: Dict[str, str] = {}  # batch id -> provider
         self._initialize_models()
     
     def _initialize_models(self):
-        """Initialize all available LLM models."""
-        logger.info("Initializing LLM models...")
+        """Register factories for every configured LLM; clients are built on first use."""
+        logger.info("Registering LLM models...")
         
         # OpenAI
         if settings.openai_api_key and settings.openai_api_key != "your_openai_key":
-            try:
-                self.models["openai"] = ChatOpenAI(
-                    api_key=settings.openai_api_key,
-                    model="gpt-3.5-turbo",
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                self.model_order.append("openai")
-                logger.info("OpenAI model initialized")
-            except Exception as e:
-                logger.warning(f"Failed to initialize OpenAI: {e}")
+            self._factories["openai"] = lambda temperature, cache: ChatOpenAI(
+                api_key=settings.openai_api_key,
+                model=MODEL_NAMES["openai"],
+                max_tokens=2000,
+                temperature=temperature,
+                cache=cache,
+                http_async_client=self._http
+            )
+            self.model_order.append("openai")
         
         # Groq
         if settings.groq_api_key and settings.groq_api_key != "your_groq_key":
-            try:
-                self.models["groq"] = ChatGroq(
-                    api_key=settings.groq_api_key,
-                    model="llama3-8b-8192",
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                self.model_order.append("groq")
-                logger.info("Groq model initialized")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Groq: {e}")
+            self._factories["groq"] = lambda temperature, cache: ChatGroq(
+                api_key=settings.groq_api_key,
+                model=MODEL_NAMES["groq"],
+                max_tokens=2000,
+                temperature=temperature,
+                cache=cache,
+                http_async_client=self._http
+            )
+            self.model_order.append("groq")
         
         # Google Gemini
         if settings.google_api_key and settings.google_api_key != "your_google_key":
-            try:
-                self.models["google"] = ChatGoogleGenerativeAI(
-                    api_key=settings.google_api_key,
-                    model="gemini-pro",
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                self.model_order.append("google")
-                logger.info("Google Gemini model initialized")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Google Gemini: {e}")
+            self._factories["google"] = lambda temperature, cache: ChatGoogleGenerativeAI(
+                api_key=settings.google_api_key,
+                model=MODEL_NAMES["google"],
+                max_tokens=2000,
+                temperature=temperature,
+                cache=cache
+            )
+            self.model_order.append("google")
         
         # Anthropic
         if settings.anthropic_api_key and settings.anthropic_api_key != "your_anthropic_key":
-            try:
-                self.models["anthropic"] = ChatAnthropic(
-                    api_key=settings.anthropic_api_key,
-                    model="claude-3-sonnet-20240229",
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                self.model_order.append("anthropic")
-                logger.info("Anthropic model initialized")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Anthropic: {e}")
+            self._factories["anthropic"] = lambda temperature, cache: ChatAnthropic(
+                api_key=settings.anthropic_api_key,
+                model=MODEL_NAMES["anthropic"],
+                max_tokens=2000,
+                temperature=temperature,
+                cache=cache
+            )
+            self.model_order.append("anthropic")
         
-        if not self.models:
+        if not self._factories:
             logger.error("No LLM models available! Please configure API keys in .env file")
             raise ValueError("No LLM models available! Please configure API keys in .env file")
         
-        logger.info(f"Initialized {len(self.models)} LLM models: {list(self.models.keys())}")
+        logger.info(f"Registered {len(self._factories)} LLM models: {self.model_order}")
+    
+    async def aclose(self):
+        """Close the shared HTTP connection pool."""
+        await self._http.aclose()
+    
+    def _get_model(self, name: str, extraction: bool = False):
+        """Return the reply or extraction model for name, constructing it on first use."""
+        key = (name, extraction)
+        model = self.models.get(key)
+        if model is None:
+            if extraction:
+                model = self._factories[name](EXTRACTION_TEMPERATURE, LLM_CACHE)
+            else:
+                model = self._factories[name](REPLY_TEMPERATURE, False)
+            self.models[key] = model
+            logger.info(f"{name} model initialized")
+        return model
     
     async def generate_text(
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
-        preferred_model: Optional[str] = None
+        preferred_model: Optional[str] = None,
+        extraction: bool = False
     ) -> Dict[str, Any]:
         """
         Generate text using available LLM models with fallback logic.
@@ -125,39 +188,27 @@ class LLMManager:
             prompt: The input prompt
             system_prompt: Optional system prompt
             preferred_model: Preferred model to try first
+            extraction: Run deterministically through the persistent cache
             
         Returns:
             Dictionary with response, model_used, and success status
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Determine which models to try
-        models_to_try = []
-        if preferred_model and preferred_model in self.models:
-            models_to_try.append(preferred_model)
-        
-        # Add other models in order
-        for model in self.model_order:
-            if model not in models_to_try:
-                models_to_try.append(model)
+        models_to_try = self._models_to_try(preferred_model)
+        messages = self._build_messages(prompt, system_prompt)
         
         # Try each model until one succeeds
         for model_name in models_to_try:
             try:
-                logger.info(f"Trying {model_name} model...")
-                
-                model = self.models[model_name]
+                logger.info("Trying %s model...", model_name)
                 
-                # Prepare messages
-                messages = []
-                if system_prompt:
-                    messages.append(SystemMessage(content=system_prompt))
-                messages.append(HumanMessage(content=prompt))
+                model = self._get_model(model_name, extraction)
                 
                 # Generate response
                 response = await model.ainvoke(messages)
                 
-                processing_time = time.time() - start_time
+                processing_time = time.perf_counter() - start_time
                 
                 result = {
                     "success": True,
@@ -167,15 +218,181 @@ class LLMManager:
                     "error": None
                 }
                 
-                logger.info(f"Successfully generated response using {model_name} in {processing_time:.2f}s")
+                logger.info("Successfully generated response using %s in %.2fs", model_name, processing_time)
                 return result
                 
             except Exception as e:
-                logger.warning(f"Failed to generate response with {model_name}: {e}")
+                logger.warning("Failed to generate response with %s: %s", model_name, e)
                 continue
         
         # If all models failed
-        processing_time = time.time() - start_time
+        return self._failure_result(start_time)
+    
+    async def generate_text_hedged(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        preferred_model: Optional[str] = None,
+        hedge_after: float = 2.0
+    ) -> Dict[str, Any]:
+        """
+        Generate text, racing the next model if the current one is slow.
+        
+        Every hedge_after seconds without an answer (or immediately after a
+        failure) the next model in the fallback order is started alongside the
+        ones in flight. The first successful response wins and the rest are
+        cancelled, so latency tracks the fastest model rather than the sum.
+        
+        Args:
+            prompt: The input prompt
+            system_prompt: Optional system prompt
+            preferred_model: Preferred model to try first
+            hedge_after: Seconds to wait before starting the next model
+            
+        Returns:
+            Dictionary with response, model_used, and success status
+        """
+        # =============== start generate_text_hedged ======
+        start_time = time.perf_counter()
+        
+        remaining = iter(self._models_to_try(preferred_model))
+        messages = self._build_messages(prompt, system_prompt)
+        tasks: Dict[asyncio.Task, str] = {}
+        
+        def launch_next() -> None:
+            model_name = next(remaining, None)
+            while model_name is not None:
+                logger.info("Trying %s model...", model_name)
+                try:
+                    model = self._get_model(model_name)
+                except Exception as e:
+                    logger.warning(f"Failed to initialize {model_name}: {e}")
+                    model_name = next(remaining, None)
+                    continue
+                tasks[asyncio.create_task(model.ainvoke(messages))] = model_name
+                return
+        
+        launch_next()
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks.keys(), timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch_next()
+                    continue
+                
+                for task in done:
+                    model_name = tasks.pop(task)
+                    if task.exception() is None:
+                        processing_time = time.perf_counter() - start_time
+                        logger.info("Successfully generated response using %s in %.2fs", model_name, processing_time)
+                        return {
+                            "success": True,
+                            "response": task.result().content,
+                            "model_used": model_name,
+                            "processing_time": processing_time,
+                            "error": None
+                        }
+                    logger.warning("Failed to generate response with %s: %s", model_name, task.exception())
+                    launch_next()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return self._failure_result(start_time)
+    
+    async def generate_text_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        preferred_model: Optional[str] = None,
+        max_concurrency: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate text for many prompts with a single abatch call.
+        
+        Items the first model fails on are retried individually through
+        generate_text_hedged, so one bad prompt never fails the whole batch.
+        
+        Args:
+            prompts: The input prompts
+            system_prompt: Optional system prompt shared by every prompt
+            preferred_model: Preferred model to try first
+            max_concurrency: Maximum requests in flight at once
+            
+        Returns:
+            List of generate_text-shaped dictionaries, in prompt order
+        """
+        # =============== start generate_text_batch ======
+        if not prompts:
+            return []
+        
+        start_time = time.perf_counter()
+        model_name = self._models_to_try(preferred_model)[0]
+        all_messages = [self._build_messages(prompt, system_prompt) for prompt in prompts]
+        
+        try:
+            responses = await self._get_model(model_name).abatch(
+                all_messages,
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+        except Exception as e:
+            logger.warning(f"Batch generation with {model_name} failed: {e}")
+            responses = [e] * len(prompts)
+        
+        processing_time = time.perf_counter() - start_time
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        retry_indices = []
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                retry_indices.append(i)
+            else:
+                results[i] = {
+                    "success": True,
+                    "response": response.content,
+                    "model_used": model_name,
+                    "processing_time": processing_time,
+                    "error": None
+                }
+        
+        if retry_indices:
+            logger.warning(f"Retrying {len(retry_indices)}/{len(prompts)} batch items individually")
+            retried = await asyncio.gather(*(
+                self.generate_text_hedged(prompts[i], system_prompt, preferred_model)
+                for i in retry_indices
+            ))
+            for i, result in zip(retry_indices, retried):
+                results[i] = result
+        
+        logger.info(f"Batch generated {len(prompts)} responses using {model_name} in {time.perf_counter() - start_time:.2f}s")
+        return results
+    
+    def _models_to_try(self, preferred_model: Optional[str] = None) -> List[str]:
+        """Return model names in fallback order, preferred model first."""
+        models_to_try = []
+        if preferred_model and preferred_model in self._factories:
+            models_to_try.append(preferred_model)
+        
+        # Add other models in order
+        for model in self.model_order:
+            if model not in models_to_try:
+                models_to_try.append(model)
+        return models_to_try
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> list:
+        """Build the message list for a prompt."""
+        messages = []
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+        messages.append(HumanMessage(content=prompt))
+        return messages
+    
+    def _failure_result(self, start_time: float) -> Dict[str, Any]:
+        """Build the result returned when every model failed."""
+        processing_time = time.perf_counter() - start_time
         error_msg = "All LLM models failed to generate response"
         logger.error(error_msg)
         
@@ -194,9 +411,7 @@ class LLMManager:
         preferred_model: Optional[str] = None
     ) -> str:
         """Generate email reply with fallback logic."""
-        system_prompt = f"""You are a professional email assistant. Generate a helpful, 
-        concise reply to {sender_name}. Be polite, professional, and address their concerns appropriately.
-        Keep the response brief and to the point."""
+        system_prompt = EMAIL_REPLY_SYSTEM_PROMPT.format(sender_name=sender_name)
         
         result = await self.generate_text(
             prompt=email_content,
@@ -215,13 +430,16 @@ class LLMManager:
         preferred_model: Optional[str] = None
     ) -> Optional[str]:
         """Extract sender name with fallback logic."""
-        system_prompt = """You are an expert email parser. Extract the sender's name from the email content. 
-        Return only the name, nothing else. If no clear name is found, return 'Unknown'."""
+        # Clear "From:" headers and sign-offs don't need an LLM round-trip
+        name = EmailParser.extract_sender_name_fast(email_content)
+        if name:
+            return name
         
         result = await self.generate_text(
             prompt=email_content,
-            system_prompt=system_prompt,
-            preferred_model=preferred_model
+            system_prompt=SENDER_NAME_SYSTEM_PROMPT,
+            preferred_model=preferred_model,
+            extraction=True
         )
         
         if result["success"]:
@@ -230,15 +448,161 @@ class LLMManager:
         else:
             return None
     
+    def _get_batch_client(self, provider: str):
+        """Return the provider SDK client used for batch jobs, constructing it on first use."""
+        if provider not in ("openai", "anthropic"):
+            raise ValueError(f"Batch API not supported for provider: {provider}")
+        if provider not in self._factories:
+            raise ValueError(f"Provider {provider} is not configured")
+        
+        client = self._batch_clients.get(provider)
+        if client is None:
+            if provider == "openai":
+                client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=self._http)
+            else:
+                client = AsyncAnthropic(api_key=settings.anthropic_api_key, http_client=self._http)
+            self._batch_clients[provider] = client
+        return client
+    
+    async def submit_batch(
+        self,
+        prompts: List[str],
+        provider: str = "openai",
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Submit prompts to a provider's offline batch API (24h turnaround, lower cost).
+        
+        Args:
+            prompts: The input prompts
+            provider: "openai" or "anthropic"
+            system_prompt: Optional system prompt shared by every prompt
+            
+        Returns:
+            The provider batch id, to pass to poll_batch
+        """
+        # =============== start submit_batch ======
+        client = self._get_batch_client(provider)
+        model = MODEL_NAMES[provider]
+        
+        if provider == "openai":
+            system = [{"role": "system", "content": system_prompt}] if system_prompt else []
+            lines = b"\n".join(
+                orjson.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "max_tokens": 2000,
+                        "temperature": 0.7,
+                        "messages": system + [{"role": "user", "content": prompt}]
+                    }
+                })
+                for i, prompt in enumerate(prompts)
+            )
+            batch_file = await client.files.create(file=("batch.jsonl", lines), purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        else:
+            params = {"model": model, "max_tokens": 2000, "temperature": 0.7}
+            if system_prompt:
+                params["system"] = system_prompt
+            batch = await client.messages.batches.create(requests=[
+                {
+                    "custom_id": str(i),
+                    "params": {**params, "messages": [{"role": "user", "content": prompt}]}
+                }
+                for i, prompt in enumerate(prompts)
+            ])
+        
+        self._batch_providers[batch.id] = provider
+        logger.info(f"Submitted {len(prompts)} prompts to {provider} batch {batch.id}")
+        return batch.id
+    
+    async def poll_batch(self, batch_id: str, provider: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Check a batch submitted with submit_batch and collect its results once finished.
+        
+        Args:
+            batch_id: The id returned by submit_batch
+            provider: Provider of the batch; looked up from submit_batch when omitted
+            
+        Returns:
+            Dictionary with the provider status and, when finished, a list of
+            generate_text-shaped results in prompt order (otherwise None)
+        """
+        # =============== start poll_batch ======
+        provider = provider or self._batch_providers.get(batch_id)
+        if provider is None:
+            # Anthropic batch ids are prefixed "msgbatch_", OpenAI ones "batch_"
+            provider = "anthropic" if batch_id.startswith("msgbatch_") else "openai"
+        client = self._get_batch_client(provider)
+        model_name = MODEL_NAMES[provider]
+        outputs: Dict[int, Dict[str, Any]] = {}
+        
+        if provider == "openai":
+            batch = await client.batches.retrieve(batch_id)
+            status = batch.status
+            if status != "completed":
+                return {"status": status, "results": None}
+            
+            total = batch.request_counts.total if batch.request_counts else 0
+            if batch.output_file_id:
+                content = await client.files.content(batch.output_file_id)
+                for line in content.content.splitlines():
+                    if not line:
+                        continue
+                    item = orjson.loads(line)
+                    response = item.get("response") or {}
+                    if response.get("status_code") == 200:
+                        outputs[int(item["custom_id"])] = {
+                            "response": response["body"]["choices"][0]["message"]["content"]
+                        }
+                    else:
+                        outputs[int(item["custom_id"])] = {"error": str(item.get("error") or response)}
+        else:
+            batch = await client.messages.batches.retrieve(batch_id)
+            status = batch.processing_status
+            if status != "ended":
+                return {"status": status, "results": None}
+            
+            counts = batch.request_counts
+            total = counts.succeeded + counts.errored + counts.canceled + counts.expired
+            async for entry in await client.messages.batches.results(batch_id):
+                if entry.result.type == "succeeded":
+                    outputs[int(entry.custom_id)] = {"response": entry.result.message.content[0].text}
+                else:
+                    outputs[int(entry.custom_id)] = {"error": f"Batch request {entry.result.type}"}
+        
+        results = []
+        for i in range(max(total, max(outputs, default=-1) + 1)):
+            output = outputs.get(i, {"error": "Missing from batch output"})
+            succeeded = "response" in output
+            results.append({
+                "success": succeeded,
+                "response": output["response"] if succeeded else "I apologize, but I'm unable to generate a response at this time. Please try again later.",
+                "model_used": provider if succeeded else None,
+                "processing_time": None,
+                "error": output.get("error")
+            })
+        
+        self._batch_providers.pop(batch_id, None)
+        logger.info(f"Collected {len(results)} results from {provider} batch {batch_id} ({model_name})")
+        return {"status": status, "results": results}
+    
     def get_available_models(self) -> List[str]:
         """Get list of available models."""
-        return list(self.models.keys())
+        return list(self.model_order)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about available models."""
         return {
             "available_models": self.get_available_models(),
-            "model_count": len(self.models),
+            "model_count": len(self._factories),
             "model_order": self.model_order
         }
 
@@ -29,6 +29,9 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# LangSmith tracing blocks on callback dispatch; keep it opt-in via .env or the environment
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
 class Settings(BaseSettings):
     """Centralized configuration settings with Pydantic validation."""
     
@@ -57,6 +60,15 @@ class Settings(BaseSettings):
     max_tokens: int = Field(2000, env="MAX_TOKENS")
     temperature: float = Field(0.7, env="TEMPERATURE")
     
+    # LLM Response Cache Configuration
+    llm_cache_path: str = Field("data/llm_cache.db", env="LLM_CACHE_PATH")
+    redis_url: Optional[str] = Field(None, env="REDIS_URL")
+    
+    # Request Batching Configuration
+    batch_window_ms: int = Field(5, env="BATCH_WINDOW_MS")
+    batch_max_size: int = Field(32, env="BATCH_MAX_SIZE")
+    batch_max_concurrency: int = Field(32, env="BATCH_MAX_CONCURRENCY")
+    
     # Streaming Configuration
     enable_streaming: bool = Field(True, env="ENABLE_STREAMING")
     stream_chunk_size: int = Field(100, env="STREAM_CHUNK_SIZE")
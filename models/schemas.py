@@ -0,0 +1,51 @@
+"""
+===========================================================
+Project: Agents-Rag
+Developer: Yallaiah Onteru
+Contact: yonteru414@gmail.com | GitHub: @https://yonteru414.github.io/Yallaiah-AI-ML-Engineer/
+Support: yonteru.ai.engineer@gmail.com
+===========================================================
+
+Description:
+------------
+Data Schemas
+Pydantic models for structured data shared across agents.
+
+Main Use:
+---------
+Structured data models that:
+1. Enumerate the supported AI providers
+2. Describe AI responses with usage metrics
+3. Describe streaming response chunks
+"""
+
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+
+class AIProvider(str, Enum):
+    """Supported AI providers; values match the keys used in settings."""
+
+    OPENAI = "openai"
+    GROQ = "groq"
+    GOOGLE = "google"
+    ANTHROPIC = "anthropic"
+
+class AIResponse(BaseModel):
+    """Response generated by an AI provider."""
+
+    # Allow the model_used field name
+    model_config = ConfigDict(protected_namespaces=())
+
+    reply: str = Field(..., description="Generated response text")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
+    model_used: str = Field(..., description="Model that generated the response")
+    provider: AIProvider = Field(..., description="Provider that generated the response")
+    tokens_used: int = Field(0, description="Total tokens used")
+    processing_time: float = Field(..., description="Processing time in seconds")
+
+class StreamingChunk(BaseModel):
+    """Single chunk of a streaming AI response."""
+
+    chunk_id: str = Field(..., description="Chunk identifier")
+    content: str = Field(..., description="Chunk text")
+    is_final: bool = Field(False, description="Whether this is the last chunk")
@@ -20,12 +20,50 @@ Google Sheets integration that:
 4. Manages authentication and API calls
 """
 
+import asyncio
 import os
+import random
+import time
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from typing import Dict, List, Optional
+from googleapiclient.errors import HttpError
+from typing import Callable, Dict, List, Optional
 from config.settings import settings
 
+# Buffered rows are appended in one API call once this many are queued, or
+# SHEETS_FLUSH_DELAY seconds after the first, keeping us under the write quota
+SHEETS_FLUSH_ROWS = 50
+SHEETS_FLUSH_DELAY = 2.0
+
+# HTTP statuses the Sheets API returns for transient failures worth retrying
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Cap on in-flight Sheets requests, and the sustained rate/burst they may start at
+SHEETS_MAX_CONCURRENCY = 8
+SHEETS_REQUESTS_PER_SECOND = 5.0
+SHEETS_BURST = 10
+
+class _TokenBucket:
+    """Token bucket rate limiter: up to `burst` requests at once, `rate` per second sustained."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_call = time.perf_counter()
+    
+    async def acquire(self):
+        """Wait until a request may be sent, then consume a token."""
+        # =============== start acquire ======
+        while True:
+            now = time.perf_counter()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_call) * self.rate)
+            self.last_call = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class SheetsService:
     """Service for interacting with Google Sheets."""
     
@@ -33,14 +71,21 @@ class SheetsService:
         """Initialize Google Sheets service."""
         # =============== start __init__ ======
         self.service = None
-        self.sheet_id = settings.SHEET_ID
+        self.sheet_id = settings.sheet_id
+        # Rows waiting to be appended, written together by flush()
+        self._buffer: List[List[str]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Shared by every API call so concurrent flushes can't burst past the quota
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._bucket = _TokenBucket(SHEETS_REQUESTS_PER_SECOND, SHEETS_BURST)
         self._initialize_service()
     
     def _initialize_service(self):
         """Initialize the Google Sheets API service."""
         # =============== start _initialize_service ======
         try:
-            if not settings.GOOGLE_SHEETS_CREDENTIALS:
+            if not settings.google_sheets_credentials:
                 print("Google Sheets credentials not configured")
                 return
             
@@ -49,7 +94,7 @@ class SheetsService:
             
             # Load credentials
             creds = Credentials.from_service_account_file(
-                settings.GOOGLE_SHEETS_CREDENTIALS, 
+                settings.google_sheets_credentials, 
                 scopes=scope
             )
             
@@ -61,9 +106,11 @@ class SheetsService:
             print(f"Error initializing Google Sheets service: {e}")
             self.service = None
     
-    def log_email_data(self, sender_name: str, email_content: str, reply: str) -> bool:
+    async def log_email_data(self, sender_name: str, email_content: str, reply: str) -> bool:
         """
-        Log email data to Google Sheets.
+        Queue email data for logging to Google Sheets.
+        
+        Rows are buffered and appended in batches rather than one API call each.
         
         Args:
             sender_name: Name of the sender
@@ -71,32 +118,117 @@ class SheetsService:
             reply: Generated reply
             
         Returns:
-            True if successful, False otherwise
+            True if queued, False if the service is unavailable
         """
         # =============== start log_email_data ======
         if not self.service:
             print("Google Sheets service not available")
             return False
         
-        try:
-            # Prepare data for insertion
-            values = [[sender_name, email_content[:1000], reply[:1000], "processed"]]
+        self._buffer.append([sender_name, email_content[:1000], reply[:1000], "processed"])
+        if len(self._buffer) >= SHEETS_FLUSH_ROWS:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return True
+    
+    async def _flush_later(self):
+        """Flush buffered rows once the debounce delay has passed."""
+        # =============== start _flush_later ======
+        await asyncio.sleep(SHEETS_FLUSH_DELAY)
+        self._flush_task = None
+        await self.flush()
+    
+    async def flush(self) -> bool:
+        """
+        Append all buffered rows to Google Sheets in a single API call.
+        
+        Returns:
+            True if successful (or nothing to write), False otherwise
+        """
+        # =============== start flush ======
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        # Created lazily so the lock binds to the running loop (Python < 3.10)
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return True
             
-            # Insert data
-            body = {'values': values}
-            result = self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range=settings.SHEET_RANGE,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+            try:
+                result = await self._execute_with_backoff(lambda: self._append_rows(rows))
+                print(f"Data logged to Google Sheets: {result.get('updates', {}).get('updatedRows', 0)} rows")
+                return True
             
-            print(f"Data logged to Google Sheets: {result.get('updates', {}).get('updatedRows', 0)} rows")
-            return True
+            except Exception as e:
+                print(f"Error logging to Google Sheets: {e}")
+                return False
+    
+    async def _execute_with_backoff(
+        self,
+        fn: Callable[[], Dict],
+        *,
+        max_attempts: int = 5,
+        base: float = 1.0,
+        cap: float = 30.0
+    ) -> Dict:
+        """
+        Run a blocking Sheets API call, retrying rate-limit and server errors.
+        
+        Waits base * 2**attempt seconds (capped, with jitter) between attempts,
+        or the server's Retry-After when it sends one.
+        
+        Args:
+            fn: Zero-argument callable that performs the request
+            max_attempts: Total attempts before giving up
+            base: Initial backoff in seconds
+            cap: Maximum backoff in seconds
             
-        except Exception as e:
-            print(f"Error logging to Google Sheets: {e}")
-            return False
+        Returns:
+            The API response
+        """
+        # =============== start _execute_with_backoff ======
+        # Created lazily so the semaphore binds to the running loop (Python < 3.10)
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(SHEETS_MAX_CONCURRENCY)
+        
+        for attempt in range(max_attempts):
+            try:
+                # Backoff sleeps happen outside the semaphore so they don't hold a slot
+                async with self._sem:
+                    await self._bucket.acquire()
+                    return await asyncio.to_thread(fn)
+            except HttpError as e:
+                content = e.content or b""
+                retryable = (
+                    e.resp.status in RETRYABLE_STATUSES
+                    or b"rateLimitExceeded" in content
+                    or b"quota" in content
+                )
+                if not retryable or attempt == max_attempts - 1:
+                    raise
+                
+                retry_after = e.resp.get("retry-after")
+                if retry_after and retry_after.isdigit():
+                    delay = min(cap, float(retry_after))
+                else:
+                    delay = min(cap, base * 2 ** attempt) + random.random() * 0.25
+                print(f"Google Sheets request failed with {e.resp.status}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+    
+    def _append_rows(self, rows: List[List[str]]) -> Dict:
+        """Append rows to the sheet with one values.append request (blocking)."""
+        # =============== start _append_rows ======
+        return self.service.spreadsheets().values().append(
+            spreadsheetId=self.sheet_id,
+            range=settings.sheet_range,
+            valueInputOption='RAW',
+            body={'values': rows}
+        ).execute()
     
     def get_processed_emails(self) -> List[Dict[str, str]]:
         """
@@ -112,7 +244,7 @@ class SheetsService:
         try:
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.sheet_id,
-                range=settings.SHEET_RANGE
+                range=settings.sheet_range
             ).execute()
             
             values = result.get('values', [])
@@ -23,6 +23,45 @@ Email parsing utilities that:
 import re
 from typing import Optional, Dict
 
+# Unambiguous sender name sources: a "From: Name" header line, or a capitalised
+# name on the line after a comma-terminated sign-off such as "Best regards,"
+_SENDER_HEADER_RE = re.compile(
+    r'^(?i:from):[ \t]*"?([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+){0,2})"?[ \t]*(?:<[^>\n]*>)?[ \t]*$',
+    re.MULTILINE
+)
+_SIGN_OFF_RE = re.compile(
+    r'^[ \t]*(?i:best[ \t]+regards|kind[ \t]+regards|warm[ \t]+regards|regards|sincerely'
+    r'|thanks|thank[ \t]+you|cheers),[ \t]*\n'
+    r'[ \t]*([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+){0,2})[ \t]*$',
+    re.MULTILINE
+)
+
+# Email address pattern, compiled once at import
+_EMAIL_ADDRESS_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Fallback sender name patterns, tried in order
+_SENDER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'From:\s*([^<\n]+)',
+        r'Sender:\s*([^<\n]+)',
+        r'^([^<\n]+)\s*<[^>]+>',  # Name <email@domain.com>
+        r'^([^@\n]+)@',  # name@domain.com
+    )
+]
+
+# Common header lines in one alternation, so the content is scanned once
+_HEADERS_RE = re.compile(
+    r'^(?P<name>From|To|Subject|Date|Reply-To):[ \t]*(?P<value>[^\n]+)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Name and content cleanup patterns
+_QUOTES_RE = re.compile(r'["\']')
+_WS_RE = re.compile(r'\s+')
+_QUOTE_MARK_RE = re.compile(r'^>+', re.MULTILINE)
+_REPLY_RE = re.compile(r'On .+ wrote:', re.IGNORECASE)
+
 class EmailParser:
     """Utility class for parsing email content."""
     
@@ -38,26 +77,36 @@ class EmailParser:
             Extracted sender name or None if not found
         """
         # =============== start extract_sender_name_fallback ======
-        # Common patterns for sender name extraction
-        patterns = [
-            r'From:\s*([^<\n]+)',
-            r'Sender:\s*([^<\n]+)',
-            r'^([^<\n]+)\s*<[^>]+>',  # Name <email@domain.com>
-            r'^([^@\n]+)@',  # name@domain.com
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, email_content, re.IGNORECASE | re.MULTILINE)
+        for pattern in _SENDER_PATTERNS:
+            match = pattern.search(email_content)
             if match:
                 name = match.group(1).strip()
                 # Clean up the name
-                name = re.sub(r'["\']', '', name)  # Remove quotes
-                name = re.sub(r'\s+', ' ', name)  # Normalize whitespace
+                name = _QUOTES_RE.sub('', name)  # Remove quotes
+                name = _WS_RE.sub(' ', name)  # Normalize whitespace
                 if name and len(name) > 1:
                     return name
         
         return None
     
+    @staticmethod
+    def extract_sender_name_fast(email_content: str) -> Optional[str]:
+        """
+        Extract sender name only when a header or sign-off makes it unambiguous.
+        
+        Used as a fast path before AI extraction; returns None whenever the
+        AI should decide instead.
+        
+        Args:
+            email_content: Raw email content
+            
+        Returns:
+            Sender name or None if no clear match
+        """
+        # =============== start extract_sender_name_fast ======
+        match = _SENDER_HEADER_RE.search(email_content) or _SIGN_OFF_RE.search(email_content)
+        return match.group(1) if match else None
+    
     @staticmethod
     def extract_email_address(email_content: str) -> Optional[str]:
         """
@@ -70,8 +119,7 @@ class EmailParser:
             Email address or None if not found
         """
         # =============== start extract_email_address ======
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, email_content)
+        match = _EMAIL_ADDRESS_RE.search(email_content)
         return match.group(0) if match else None
     
     @staticmethod
@@ -88,19 +136,10 @@ class EmailParser:
         # =============== start parse_email_headers ======
         headers = {}
         
-        # Common header patterns
-        header_patterns = {
-            'from': r'From:\s*([^\n]+)',
-            'to': r'To:\s*([^\n]+)',
-            'subject': r'Subject:\s*([^\n]+)',
-            'date': r'Date:\s*([^\n]+)',
-            'reply_to': r'Reply-To:\s*([^\n]+)',
-        }
-        
-        for header_name, pattern in header_patterns.items():
-            match = re.search(pattern, email_content, re.IGNORECASE)
-            if match:
-                headers[header_name] = match.group(1).strip()
+        for match in _HEADERS_RE.finditer(email_content):
+            # First occurrence of each header wins, e.g. over quoted replies below
+            header_name = match.group('name').lower().replace('-', '_')
+            headers.setdefault(header_name, match.group('value').strip())
         
         return headers
     
@@ -116,11 +155,11 @@ class EmailParser:
             Cleaned email content
         """
         # Remove excessive whitespace
-        content = re.sub(r'\s+', ' ', email_content)
+        content = _WS_RE.sub(' ', email_content)
         
         # Remove common email artifacts
-        content = re.sub(r'^>+', '', content, flags=re.MULTILINE)  # Remove quote markers
-        content = re.sub(r'On .+ wrote:', '', content, flags=re.IGNORECASE)  # Remove reply headers
+        content = _QUOTE_MARK_RE.sub('', content)  # Remove quote markers
+        content = _REPLY_RE.sub('', content)  # Remove reply headers
         
         return content.strip()
     
@@ -143,10 +182,10 @@ class EmailParser:
         ]
         
         for separator in separators:
-            if separator in email_content:
-                parts = email_content.split(separator, 1)
-                if len(parts) > 1:
-                    return parts[1].strip()
+            # One scan per separator: find locates it and gives the slice point
+            index = email_content.find(separator)
+            if index != -1:
+                return email_content[index + len(separator):].strip()
         
         # If no separator found, return the whole content
         return email_content.strip()
@@ -20,8 +20,11 @@ Centralized logging system that:
 4. Handles email processing and AI operation logging
 """
 
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from typing import Optional
 from config.settings import settings
@@ -45,14 +48,16 @@ class Logger:
             self._setup_handlers()
     
     def _setup_handlers(self):
-        """Set up console and file handlers."""
+        """Set up console and file handlers behind a queue so logging never blocks the caller."""
         # =============== start _setup_handlers ======
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         
-        # File handler
-        file_handler = logging.FileHandler(settings.log_file, encoding='utf-8')
+        # File handler, rotated at 10 MB
+        file_handler = RotatingFileHandler(
+            settings.log_file, maxBytes=10_485_760, backupCount=5, encoding='utf-8'
+        )
         file_handler.setLevel(logging.DEBUG)
         
         # Formatter
@@ -62,30 +67,39 @@ class Logger:
         console_handler.setFormatter(formatter)
         file_handler.setFormatter(formatter)
         
-        # Add handlers
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+        # Log calls only enqueue the record; a listener thread does the writes,
+        # keeping stream and disk I/O off the event loop
+        log_queue = queue.SimpleQueue()
+        self.listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
+        
+        self.logger.addHandler(QueueHandler(log_queue))
     
-    def info(self, message: str):
+    # Extra args are passed through for %-style formatting, which logging skips
+    # entirely when the level is disabled
+    def info(self, message: str, *args, **kwargs):
         """Log info message."""
         # =============== start info ======
-        self.logger.info(message)
+        self.logger.info(message, *args, **kwargs)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message."""
-        self.logger.debug(message)
+        self.logger.debug(message, *args, **kwargs)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str):
+    def error(self, message: str, *args, **kwargs):
         """Log error message."""
-        self.logger.error(message)
+        self.logger.error(message, *args, **kwargs)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args, **kwargs):
         """Log critical message."""
-        self.logger.critical(message)
+        self.logger.critical(message, *args, **kwargs)
     
     def log_email_processing(self, sender_name: Optional[str], success: bool, error: Optional[str] = None):
         """
@@ -21,13 +21,13 @@ Web server that:
 """
 
 import asyncio
-import json
 import time
+from collections import Counter
 from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
@@ -46,13 +46,17 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Agents web server...")
     yield
     logger.info("Shutting down AI Agents web server...")
+    await email_workflow.aclose()
+    await llm_manager.aclose()
 
 # Create FastAPI app
 app = FastAPI(
     title="AI Agents API",
     description="Simple AI Agents with LLM fallback",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Serialize API responses (e.g. the full CRM lead list) with orjson
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -273,22 +277,18 @@ async def get_available_models():
 async def get_crm_leads():
     """Get all CRM leads data."""
     try:
-        import json
-        import os
+        # Served from the workflow's CRM cache, reparsed only when the file changes
+        customers = await email_workflow.validation_agent.get_customers()
         
-        crm_file = "data/crm/customers.json"
-        if os.path.exists(crm_file):
-            with open(crm_file, 'r') as f:
-                customers = json.load(f)
-        else:
-            customers = []
+        # One pass tallies every status instead of a filtered list per count
+        status_counts = Counter(c.get("status") for c in customers)
         
         return {
             "success": True,
             "leads": customers,
             "total_count": len(customers),
-            "new_leads": len([c for c in customers if c.get("status") == "New Lead"]),
-            "existing_leads": len([c for c in customers if c.get("status") == "Existing Lead"])
+            "new_leads": status_counts["New Lead"],
+            "existing_leads": status_counts["Existing Lead"]
         }
     except Exception as e:
         logger.error(f"Error getting CRM leads: {e}")
@@ -337,41 +337,45 @@ async def batch_process_emails(
     emails: List[Dict[str, Any]],
     preferred_model: Optional[str] = None
 ):
-    """Process multiple emails in batch."""
+    """Process multiple emails in batch, a bounded number at a time."""
     try:
-        results = []
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(emails)
         
-        for i, email in enumerate(emails):
-            try:
-                email_content = email.get("content", "")
-                sender_name = email.get("sender_name")
-                
-                if not sender_name:
-                    sender_name = await llm_manager.extract_sender_name(
+        async def process_one(i: int, email: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    email_content = email.get("content", "")
+                    sender_name = email.get("sender_name")
+                    
+                    if not sender_name:
+                        sender_name = await llm_manager.extract_sender_name(
+                            email_content=email_content,
+                            preferred_model=preferred_model
+                        )
+                    
+                    reply = await llm_manager.generate_email_reply(
+                        sender_name=sender_name or "there",
                         email_content=email_content,
                         preferred_model=preferred_model
                     )
-                
-                reply = await llm_manager.generate_email_reply(
-                    sender_name=sender_name or "there",
-                    email_content=email_content,
-                    preferred_model=preferred_model
-                )
-                
-                results.append({
-                    "index": i,
-                    "success": True,
-                    "sender_name": sender_name,
-                    "reply": reply
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing email {i}: {e}")
-                results.append({
-                    "index": i,
-                    "success": False,
-                    "error": str(e)
-                })
+                    
+                    results[i] = {
+                        "index": i,
+                        "success": True,
+                        "sender_name": sender_name,
+                        "reply": reply
+                    }
+                    
+                except Exception as e:
+                    logger.error(f"Error processing email {i}: {e}")
+                    results[i] = {
+                        "index": i,
+                        "success": False,
+                        "error": str(e)
+                    }
+        
+        await asyncio.gather(*(process_one(i, email) for i, email in enumerate(emails)))
         
         # Log the batch request
         file_logger.log_request({